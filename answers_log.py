@@ -0,0 +1,35 @@
+import os
+import orjson
+from pathlib import Path
+
+# Submitted answers live in an append-only JSONL log; a legacy answers_tracker.json is migrated into it once.
+ANSWERS_PATH = Path("answers_tracker.json")
+ANSWERS_LOG_PATH = ANSWERS_PATH.with_suffix(".jsonl")
+
+def iter_jsonl(path):
+    """Yield one record per decodable line of an append-only JSONL file."""
+    if not path.exists():
+        return
+    with path.open("rb") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # torn line from a crash mid-append
+
+def append_jsonl(path, *entries):
+    """Append entries in a single write, starting on a fresh line even after a torn last line."""
+    with path.open("a+b") as f:
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        f.write(b"".join(orjson.dumps(entry) + b"\n" for entry in entries))
+
+def load_answers(json_path=ANSWERS_PATH, log_path=ANSWERS_LOG_PATH):
+    if not log_path.exists() and json_path.exists():
+        entries = orjson.loads(json_path.read_bytes()).get("answers", [])
+        if entries:
+            append_jsonl(log_path, *entries)
+    return {"user_id": "student_001", "answers": list(iter_jsonl(log_path))}
@@ -2,7 +2,9 @@
 assessment_gui.py — Updated with inline performance analytics
 """
 
-import json
+import mmap
+import orjson
+import numpy as np
 from pathlib import Path
 from datetime import datetime
 import tkinter as tk
@@ -11,6 +13,7 @@ import webbrowser
 import threading
 
 from performance_engine import analyze_performance
+from answers_log import ANSWERS_LOG_PATH, append_jsonl, load_answers
 
 # Optional imports
 try:
@@ -25,34 +28,57 @@ try:
 except Exception:
     SYMPY_AVAILABLE = False
 
-import matplotlib.pyplot as plt
+# Charts are rasterized by Agg and embedded via FigureCanvasTkAgg; no pyplot state needed
+import matplotlib
+matplotlib.use("Agg", force=True)
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # File paths
 QUESTION_BANK_PATH = Path("question_bank.json")
 PROGRESS_PATH = Path("progress_tracker.json")
-ANSWERS_PATH = Path("answers_tracker.json")
 READINESS_PATH = Path("readiness_scores.json")
 
 # Helpers
 def load_json(path, default):
     if path.exists():
-        return json.loads(path.read_text(encoding="utf-8"))
+        return orjson.loads(path.read_bytes())
     return default
 
+def load_json_mmap(path, default):
+    """Like load_json, but parses straight from a read-only memory map (for large, read-mostly files)."""
+    if not path.exists() or path.stat().st_size == 0:
+        return default
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
 def save_json(path, data):
-    path.write_text(json.dumps(data, indent=4, ensure_ascii=False), encoding="utf-8")
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 # Load data
-study_questions = load_json(QUESTION_BANK_PATH, None)
+study_questions = load_json_mmap(QUESTION_BANK_PATH, None)
 progress = load_json(PROGRESS_PATH, {"user_id":"student_001","completed_weeks":[],"completed_videos":{},"completed_books":{}})
-answers_tracker = load_json(ANSWERS_PATH, {"user_id":"student_001","answers":[]})
+answers_tracker = load_answers()
 readiness_scores = load_json(READINESS_PATH, {"user_id":"student_001","week_scores":{}, "overall": None})
+# Running total of week scores so the overall average updates in O(1)
+_score_sum = sum(readiness_scores.get("week_scores", {}).values())
+_score_count = len(readiness_scores.get("week_scores", {}))
 
 # === fallback question creation (same as before) ===
 # ... (keep your fallback block here unchanged)
 
 # === Helper functions (grading, readiness, etc.) ===
+# Parsed SymPy form of each expected answer, keyed by the answer string
+_expected_cache = {}
+
+def _sympify_expected(expected):
+    e_exp = _expected_cache.get(expected)
+    if e_exp is None:
+        e_exp = sp.sympify(expected)
+        _expected_cache[expected] = e_exp
+    return e_exp
+
 def grade_answer(q, user_answer):
     correct = None
     expected = q.get("answer")
@@ -65,7 +91,7 @@ def grade_answer(q, user_answer):
         else:
             if SYMPY_AVAILABLE:
                 try:
-                    e_exp = sp.sympify(expected)
+                    e_exp = _sympify_expected(expected)
                     e_ans = sp.sympify(user_answer)
                     correct = sp.simplify(e_exp - e_ans) == 0
                 except Exception:
@@ -77,13 +103,27 @@ def grade_answer(q, user_answer):
 
     return bool(correct), "auto" if expected is not None else "manual_review"
 
+# Columnar copy of answers_tracker["answers"], kept in sync by submit_answer
+_ANSWER_DTYPE = np.dtype([("week", np.int32), ("correct", np.bool_), ("grading_auto", np.bool_)])
+
+def _answer_rows(answers):
+    rows = []
+    for a in answers:
+        week = a.get("week")
+        # The week column is numeric, so a str/None week could never match a week lookup
+        if not isinstance(week, int):
+            raise ValueError(f"Answer record has a non-integer week: {week!r}")
+        rows.append((week, bool(a.get("correct")), a.get("grading") == "auto"))
+    return np.array(rows, dtype=_ANSWER_DTYPE)
+
+_answers_np = _answer_rows(answers_tracker.get("answers", []))
+
 def calculate_week_readiness(week_num):
-    a = [ans for ans in answers_tracker.get("answers", []) if ans.get("week") == week_num]
-    if not a:
+    in_week = _answers_np["week"] == week_num
+    total = int(in_week.sum())
+    if not total:
         return None
-    auto_gradable = [x for x in a if x.get("grading") == "auto"]
-    correct = sum(1 for x in auto_gradable if x.get("correct"))
-    total = len(a)
+    correct = int((in_week & _answers_np["correct"] & _answers_np["grading_auto"]).sum())
     score = (correct / total) * 100
     return round(score, 2)
 
@@ -103,14 +143,12 @@ ttk.Label(root, text=f"{course_title} — Assessments", style="Header.TLabel").p
 
 weeks = study_questions.get("weeks", [])
 week_names = [f"Week {w['week']}: {w['topic'][:60]}..." for w in weeks]
+_week_index_by_name = {name: i for i, name in enumerate(week_names)}
 selected_week_var = tk.StringVar(value=week_names[0] if week_names else "No weeks available")
 
 def get_selected_week():
     sel = selected_week_var.get()
-    if sel == "No weeks available":
-        return None
-    idx = week_names.index(sel)
-    return weeks[idx]
+    return weeks[_week_index_by_name[sel]] if sel in _week_index_by_name else None
 
 ttk.Label(root, text="Select Week:", font=("Segoe UI", 10)).pack()
 week_dropdown = ttk.Combobox(root, textvariable=selected_week_var, values=week_names, state="readonly", width=100)
@@ -187,36 +225,72 @@ def next_question():
         render_question(current_question_index + 1)
 
 # === PERFORMANCE INTEGRATION ===
-def show_performance_popup():
-    """Run performance analysis and show results inline."""
-    report = analyze_performance()
-    metrics = report.get("metrics", {})
+# Popup widgets and trend chart are built once, then updated in place on later opens.
+_perf_state = {"window": None, "fig": None, "ax": None, "line": None, "canvas": None,
+               "chart_frame": None, "metrics_frame": None, "msg_var": None}
 
+def _build_perf_window():
     perf_window = tk.Toplevel(root)
     perf_window.title("Performance Summary")
     perf_window.geometry("520x420")
     perf_window.configure(bg="#F3F6FB")
+    perf_window.protocol("WM_DELETE_WINDOW", perf_window.withdraw)
 
     tk.Label(perf_window, text="📊 PERFORMANCE SUMMARY", font=("Poppins", 16, "bold"), bg="#F3F6FB").pack(pady=10)
+    chart_frame = tk.Frame(perf_window, bg="#F3F6FB")
+    chart_frame.pack()
+    metrics_frame = tk.Frame(perf_window, bg="#F3F6FB")
+    metrics_frame.pack()
+    msg_var = tk.StringVar()
+    tk.Label(perf_window, textvariable=msg_var, font=("Roboto", 10, "italic"), bg="#F3F6FB").pack(pady=10)
+    ttk.Button(perf_window, text="Close", command=perf_window.withdraw).pack(pady=8)
+
+    _perf_state.update(window=perf_window, fig=None, ax=None, line=None, canvas=None,
+                       chart_frame=chart_frame, metrics_frame=metrics_frame, msg_var=msg_var)
+
+def _update_perf_chart(weeks, scores):
+    if _perf_state["canvas"] is None:
+        fig = Figure(figsize=(4.5,2))
+        ax = fig.add_subplot(111)
+        line, = ax.plot(weeks, scores, marker="o")
+        ax.set_ylim(0, 100)
+        ax.set_title("Readiness Trend")
+        ax.set_ylabel("Score (%)")
+        canvas = FigureCanvasTkAgg(fig, master=_perf_state["chart_frame"])
+        canvas.get_tk_widget().pack(pady=5)
+        _perf_state.update(fig=fig, ax=ax, line=line, canvas=canvas)
+    else:
+        _perf_state["line"].set_data(weeks, scores)
+        _perf_state["ax"].relim()
+        _perf_state["ax"].autoscale_view(scaley=False)
+    _perf_state["canvas"].draw_idle()
+
+def _compute_perf():
+    """Worker-thread half of the popup: analysis only, no Tk calls."""
+    return analyze_performance()
+
+def _render_perf_popup(report):
+    """Main-thread half of the popup: show a finished report inline."""
+    metrics = report.get("metrics", {})
+
+    if _perf_state["window"] is None or not _perf_state["window"].winfo_exists():
+        _build_perf_window()
+    perf_window = _perf_state["window"]
 
     # Inline trend chart
     scores = [v for v in metrics.get("week_trend", {}).values()]
     weeks = list(metrics.get("week_trend", {}).keys())
     if weeks and scores:
-        fig, ax = plt.subplots(figsize=(4.5,2))
-        ax.plot(weeks, scores, marker="o")
-        ax.set_ylim(0, 100)
-        ax.set_title("Readiness Trend")
-        ax.set_ylabel("Score (%)")
-        canvas = FigureCanvasTkAgg(fig, master=perf_window)
-        canvas.draw()
-        canvas.get_tk_widget().pack(pady=5)
+        _update_perf_chart(weeks, scores)
 
     # List metrics
+    metrics_frame = _perf_state["metrics_frame"]
+    for w in metrics_frame.winfo_children():
+        w.destroy()
     for key, value in metrics.items():
         if key != "week_trend":
             text = f"{key.replace('_',' ').capitalize()}: {value}"
-            tk.Label(perf_window, text=text, font=("Roboto", 11), bg="#F3F6FB", anchor="w").pack(pady=2)
+            tk.Label(metrics_frame, text=text, font=("Roboto", 11), bg="#F3F6FB", anchor="w").pack(pady=2)
 
     readiness = metrics.get("exam_readiness", 0)
     if readiness >= 75:
@@ -226,13 +300,31 @@ def show_performance_popup():
     else:
         msg = "Needs improvement — focus on weak areas 🔍"
 
-    tk.Label(perf_window, text=msg, font=("Roboto", 10, "italic"), bg="#F3F6FB").pack(pady=10)
-    ttk.Button(perf_window, text="Close", command=perf_window.destroy).pack(pady=8)
+    _perf_state["msg_var"].set(msg)
+    perf_window.deiconify()
+    perf_window.lift()
+
+def show_performance_popup():
+    """Run performance analysis off the Tk thread and show results inline."""
+    threading.Thread(target=lambda: root.after(0, _render_perf_popup, _compute_perf()), daemon=True).start()
+
+# Pending show_performance_popup call; rapid submissions collapse into one analysis
+PERF_DEBOUNCE_MS = 500
+_perf_after_id = None
+
+def _run_scheduled_performance_popup():
+    global _perf_after_id
+    _perf_after_id = None
+    show_performance_popup()
 
 def on_assessment_complete():
-    threading.Thread(target=show_performance_popup).start()
+    global _perf_after_id
+    if _perf_after_id is not None:
+        root.after_cancel(_perf_after_id)
+    _perf_after_id = root.after(PERF_DEBOUNCE_MS, _run_scheduled_performance_popup)
 
 def submit_answer():
+    global _answers_np, _score_sum, _score_count
     q = current_questions[current_question_index]
     if q.get("type") == "mcq":
         user_ans = mcq_var.get()
@@ -255,45 +347,98 @@ def submit_answer():
         "grading": grading_type,
         "source": q.get("source")
     }
+    row = _answer_rows([entry])  # validate before anything is recorded
     answers_tracker.setdefault("answers", []).append(entry)
-    save_json(ANSWERS_PATH, answers_tracker)
+    append_jsonl(ANSWERS_LOG_PATH, entry)
+    _answers_np = np.concatenate([_answers_np, row])
 
     messagebox.showinfo("Answer Submitted", f"Answer saved. Grading: {grading_type}. Correct: {graded}")
     week_num = get_selected_week().get("week")
     score = calculate_week_readiness(week_num)
     if score is not None:
-        readiness_scores.setdefault("week_scores", {})[str(week_num)] = score
-        vals = list(readiness_scores.get("week_scores", {}).values())
-        readiness_scores["overall"] = round(sum(vals)/len(vals), 2)
+        week_scores = readiness_scores.setdefault("week_scores", {})
+        old_score = week_scores.get(str(week_num))
+        if old_score is None:
+            _score_sum += score
+            _score_count += 1
+        else:
+            _score_sum += score - old_score
+        week_scores[str(week_num)] = score
+        readiness_scores["overall"] = round(_score_sum / _score_count, 2)
         save_json(READINESS_PATH, readiness_scores)
+        _refresh_readiness_trend()
 
     # ✅ Trigger performance analysis
     on_assessment_complete()
 
 # === Analytics button ===
+# Cached trend chart: the axes are drawn once, later updates only blit the line.
+_trend_win = None
+_trend_canvas = None
+_trend_fig = None
+_trend_ax = None
+_trend_line = None
+_trend_bg = None
+_trend_overall_var = None
+
+def _readiness_trend_scores():
+    week_scores = readiness_scores.get("week_scores", {})
+    return [week_scores.get(str(w.get("week")), 0) for w in weeks]
+
+def _on_trend_draw(event):
+    global _trend_bg
+    # Full redraws (first paint, resize) invalidate the cached background.
+    _trend_bg = _trend_canvas.copy_from_bbox(_trend_ax.bbox)
+    _trend_ax.draw_artist(_trend_line)
+
+def _refresh_readiness_trend():
+    """Blit the latest scores onto the cached trend chart, if it is open."""
+    if _trend_win is None or not _trend_win.winfo_exists() or _trend_bg is None:
+        return
+    _trend_line.set_ydata(_readiness_trend_scores())
+    _trend_canvas.restore_region(_trend_bg)
+    _trend_ax.draw_artist(_trend_line)
+    _trend_canvas.blit(_trend_ax.bbox)
+    _trend_overall_var.set(f"Overall readiness: {readiness_scores.get('overall', 0)}%")
+
 def open_readiness_analytics():
+    global _trend_win, _trend_canvas, _trend_fig, _trend_ax, _trend_line, _trend_bg, _trend_overall_var
+    if _trend_win is not None and _trend_win.winfo_exists():
+        _trend_win.deiconify()
+        _trend_win.lift()
+        _refresh_readiness_trend()
+        return
+
     win = tk.Toplevel(root)
     win.title("Readiness Analytics")
     win.geometry("800x600")
     win.configure(bg="#fbfdff")
 
     ttk.Label(win, text="Readiness Scores", font=("Segoe UI", 12, "bold")).pack(pady=6)
-    week_labels = [f"W{w['week']}" for w in study_questions.get("weeks", [])]
-    scores = [readiness_scores.get("week_scores", {}).get(str(w.get("week")), 0) for w in study_questions.get("weeks", [])]
-
-    fig, ax = plt.subplots(figsize=(8,3))
-    ax.plot(week_labels, scores, marker='o')
+    week_scores = readiness_scores.get("week_scores", {})
+    week_labels, scores = [], []
+    for w in weeks:
+        week_labels.append(f"W{w['week']}")
+        scores.append(week_scores.get(str(w.get("week")), 0))
+
+    fig = Figure(figsize=(8,3))
+    ax = fig.add_subplot(111)
+    line, = ax.plot(week_labels, scores, marker='o', animated=True)
     ax.set_ylim(0, 100)
     ax.set_ylabel("Score (%)")
     ax.set_xlabel("Week")
     ax.set_title("Week-by-week Readiness Trend")
 
     canvas = FigureCanvasTkAgg(fig, master=win)
-    canvas.draw()
     canvas.get_tk_widget().pack(pady=10)
 
-    overall = readiness_scores.get("overall", 0)
-    ttk.Label(win, text=f"Overall readiness: {overall}%", font=("Segoe UI", 10)).pack(pady=6)
+    _trend_win, _trend_canvas, _trend_fig, _trend_ax, _trend_line = win, canvas, fig, ax, line
+    _trend_bg = None
+    canvas.mpl_connect("draw_event", _on_trend_draw)
+    canvas.draw()
+
+    _trend_overall_var = tk.StringVar(value=f"Overall readiness: {readiness_scores.get('overall', 0)}%")
+    ttk.Label(win, textvariable=_trend_overall_var, font=("Segoe UI", 10)).pack(pady=6)
 
 btn_frame = ttk.Frame(root)
 btn_frame.pack(pady=8)
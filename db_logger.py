@@ -1,30 +1,74 @@
 from pymongo import MongoClient
 from dotenv import load_dotenv
 import os
-import uuid
+from bson import ObjectId
+import queue
+import atexit
+import threading
 from datetime import datetime
 
 # Load environment variables
 load_dotenv()
 
-# Connect to MongoDB
-client = MongoClient(os.getenv("MONGO_URI"))
+# Connect to MongoDB: fail fast on an unreachable server (default selection timeout is 30 s)
+# and compress log batches on the wire (zstd, or stdlib zlib when zstandard is missing)
+client = MongoClient(os.getenv("MONGO_URI"), serverSelectionTimeoutMS=2000, compressors="zstd,zlib")
+atexit.register(client.close)  # registered first, so it runs after _flush_pending below
 db = client[os.getenv("MONGO_DB_NAME")]
 logs_collection = db["backend_logs"]
 
+# Log entries are queued by request handlers and written in batches by a background thread
+LOG_BATCH_SIZE = 256
+_log_queue = queue.Queue()
+
+def _take_batch(first):
+    batch = [first]
+    try:
+        while len(batch) < LOG_BATCH_SIZE:
+            batch.append(_log_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return batch
+
+def _write_batch(batch):
+    try:
+        logs_collection.insert_many(batch, ordered=False)
+        print(f"[LOG] Stored {len(batch)} response(s): {', '.join(sorted({e['endpoint'] for e in batch}))}")
+    except Exception as e:
+        print(f"[ERROR] Failed to log data: {e}")
+
+def _ensure_indexes():
+    try:
+        logs_collection.create_index([("timestamp", 1), ("endpoint", 1)])
+    except Exception as e:
+        print(f"[ERROR] Failed to create log indexes: {e}")
+
+def _drain():
+    _ensure_indexes()
+    while True:
+        _write_batch(_take_batch(_log_queue.get()))
+
+def _flush_pending():
+    """Write whatever is still queued when the process exits."""
+    while True:
+        try:
+            first = _log_queue.get_nowait()
+        except queue.Empty:
+            return
+        _write_batch(_take_batch(first))
+
+threading.Thread(target=_drain, name="db-logger", daemon=True).start()
+atexit.register(_flush_pending)
+
 def log_json(endpoint_name: str, json_data: dict):
     """
     Logs JSON output from backend endpoints to MongoDB anonymously.
+    The entry is queued and inserted in the background, off the request path.
     """
     log_entry = {
-        "session_id": str(uuid.uuid4()),  # Random anonymous ID
+        "session_id": str(ObjectId()),  # Anonymous, time-ordered ID
         "endpoint": endpoint_name,
         "data": json_data,
         "timestamp": datetime.utcnow()
     }
-
-    try:
-        logs_collection.insert_one(log_entry)
-        print(f"[LOG] Stored response for endpoint: {endpoint_name}")
-    except Exception as e:
-        print(f"[ERROR] Failed to log data: {e}")
+    _log_queue.put(log_entry)
@@ -5,24 +5,76 @@ Scrapes / queries multiple education sources to get topic-related
 questions and resources. Falls back to local generation if all fail.
 """
 
-import requests, random, re
-from bs4 import BeautifulSoup
+import asyncio, atexit, random, re, shelve, threading, time
+from collections import OrderedDict
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
 
 # ----------------------------------------------------------
 # HELPER: clean topic string
 # ----------------------------------------------------------
+_NON_SLUG_RE = re.compile(r'[^A-Za-z0-9\s]')
+# Same character set as _NON_SLUG_RE, as a translate table for the common ASCII-only case
+_ASCII_NON_SLUG = str.maketrans("", "", "".join(
+    c for c in map(chr, range(128)) if not (c.isalnum() or c.isspace())))
+
 def normalize_topic(topic):
-    t = re.sub(r'[^A-Za-z0-9\s]', '', topic)
+    t = topic.translate(_ASCII_NON_SLUG) if topic.isascii() else _NON_SLUG_RE.sub('', topic)
     return t.strip().lower().replace(" ", "-")
 
+# ----------------------------------------------------------
+# HELPER: result caches (in-process per fetcher, on disk per topic)
+# ----------------------------------------------------------
+CACHE_TTL = 24 * 60 * 60  # seconds
+FETCH_CACHE_SIZE = 1024  # (fetcher, topic) entries kept in memory
+DISK_CACHE_PATH = ".edu_cache"
+_fetch_cache = OrderedDict()
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+async def cached_fetch(fetcher, client, topic):
+    key = (fetcher.__name__, normalize_topic(topic))
+    hit = _fetch_cache.get(key)
+    if hit and time.time() - hit[0] < CACHE_TTL:
+        _fetch_cache.move_to_end(key)
+        return hit[1]
+    res = await fetcher(client, topic)
+    if res:  # empty results are usually transient failures, so retry them next time
+        _fetch_cache[key] = (time.time(), res)
+        _fetch_cache.move_to_end(key)
+        if len(_fetch_cache) > FETCH_CACHE_SIZE:
+            _fetch_cache.popitem(last=False)
+    return res
+
+def _open_disk_cache():
+    """Open the shelf once per process; callers hold _disk_cache_lock."""
+    global _disk_cache
+    if _disk_cache is None:
+        _disk_cache = shelve.open(DISK_CACHE_PATH)
+        atexit.register(_disk_cache.close)
+    return _disk_cache
+
+def _disk_cache_get(key):
+    with _disk_cache_lock:
+        hit = _open_disk_cache().get(key)
+    if hit and time.time() - hit[0] < CACHE_TTL:
+        return hit[1]
+    return None
+
+def _disk_cache_set(key, value):
+    with _disk_cache_lock:
+        db = _open_disk_cache()
+        db[key] = (time.time(), value)
+        db.sync()
+
 # ----------------------------------------------------------
 # 1️⃣ Khan Academy API
 # ----------------------------------------------------------
-def fetch_from_khan(topic):
+async def fetch_from_khan(client, topic):
     try:
         key = normalize_topic(topic)
         url = f"https://www.khanacademy.org/api/v1/topic/{key}"
-        res = requests.get(url, timeout=5)
+        res = await client.get(url, timeout=5)
         if res.status_code == 200:
             data = res.json()
             return [{
@@ -40,10 +92,10 @@ def fetch_from_khan(topic):
 # ----------------------------------------------------------
 # 2️⃣ Wikipedia definitions
 # ----------------------------------------------------------
-def fetch_from_wikipedia(topic):
+async def fetch_from_wikipedia(client, topic):
     try:
         url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{normalize_topic(topic)}"
-        res = requests.get(url, timeout=5)
+        res = await client.get(url, timeout=5)
         if res.status_code == 200:
             data = res.json()
             summary = data.get("extract", "")
@@ -62,13 +114,13 @@ def fetch_from_wikipedia(topic):
 # ----------------------------------------------------------
 # 3️⃣ GeeksforGeeks scraping
 # ----------------------------------------------------------
-def fetch_from_gfg(topic):
+async def fetch_from_gfg(client, topic):
     try:
         q = "+".join(topic.split())
         url = f"https://www.geeksforgeeks.org/search/?q={q}"
-        html = requests.get(url, timeout=5).text
-        soup = BeautifulSoup(html, "html.parser")
-        links = [a["href"] for a in soup.select("a") if a.get("href","").startswith("https://www.geeksforgeeks.org/")]
+        html = (await client.get(url, timeout=5)).text
+        soup = BeautifulSoup(html, "lxml", parse_only=SoupStrainer("a", href=True))
+        links = [a["href"] for a in soup.find_all("a") if a["href"].startswith("https://www.geeksforgeeks.org/")]
         if links:
             sample = random.choice(links)
             return [{
@@ -86,13 +138,13 @@ def fetch_from_gfg(topic):
 # ----------------------------------------------------------
 # 4️⃣ Coursera / edX search (HTML titles only)
 # ----------------------------------------------------------
-def fetch_from_coursera(topic):
+async def fetch_from_coursera(client, topic):
     try:
         q = "+".join(topic.split())
         url = f"https://www.coursera.org/search?query={q}"
-        html = requests.get(url, timeout=5).text
-        soup = BeautifulSoup(html, "html.parser")
-        titles = [c.text for c in soup.select("h2.card-title")][:3]
+        html = (await client.get(url, timeout=5)).text
+        soup = BeautifulSoup(html, "lxml", parse_only=SoupStrainer("h2", class_="card-title"))
+        titles = [c.text for c in soup.find_all("h2", limit=3)]
         if titles:
             return [{
                 "type": "reference",
@@ -109,12 +161,12 @@ def fetch_from_coursera(topic):
 # ----------------------------------------------------------
 # 5️⃣ Google Custom Search API (optional, needs key)
 # ----------------------------------------------------------
-def fetch_from_google(topic, api_key=None, cx=None):
+async def fetch_from_google(client, topic, api_key=None, cx=None):
     if not api_key or not cx:
         return []
     try:
         params = {"key": api_key, "cx": cx, "q": topic}
-        res = requests.get("https://www.googleapis.com/customsearch/v1", params=params, timeout=5)
+        res = await client.get("https://www.googleapis.com/customsearch/v1", params=params, timeout=5)
         data = res.json()
         items = data.get("items", [])
         results = []
@@ -155,14 +207,51 @@ def local_generator(topic):
 # ----------------------------------------------------------
 # 🔁 Unified fetcher
 # ----------------------------------------------------------
-def fetch_questions_for_topic(topic, google_api=None, google_cx=None):
+FETCHERS = [fetch_from_khan, fetch_from_wikipedia, fetch_from_gfg, fetch_from_coursera]
+USER_AGENT = "SmartLearningAI/2.0"
+
+_client = None
+
+def get_client():
+    """Long-lived pooled keep-alive client shared by every fetch; close it with aclose_client()."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+    return _client
+
+async def aclose_client():
+    """Close the shared client; call on shutdown from the loop that used it."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+async def _fetch_all(client, topic, google_api, google_cx):
     all_results = []
-    for fetcher in [fetch_from_khan, fetch_from_wikipedia, fetch_from_gfg, fetch_from_coursera]:
-        res = fetcher(topic)
-        if res:
+    results = await asyncio.gather(*(cached_fetch(f, client, topic) for f in FETCHERS), return_exceptions=True)
+    for res in results:
+        if res and not isinstance(res, Exception):
             all_results.extend(res)
     if not all_results and google_api and google_cx:
-        all_results.extend(fetch_from_google(topic, google_api, google_cx))
-    if not all_results:
+        all_results.extend(await fetch_from_google(client, topic, google_api, google_cx))
+    return all_results
+
+async def fetch_questions_for_topic_async(topic, google_api=None, google_cx=None, client=None):
+    """Query all sources concurrently over the shared HTTP/2 client (or the one given)."""
+    key = normalize_topic(topic)
+    # Shelf I/O blocks, so keep it off the event loop
+    cached = await asyncio.to_thread(_disk_cache_get, key)
+    if cached is not None:
+        return cached
+
+    all_results = await _fetch_all(client or get_client(), topic, google_api, google_cx)
+    if all_results:
+        await asyncio.to_thread(_disk_cache_set, key, all_results)
+    else:
         all_results.extend(local_generator(topic))
     return all_results
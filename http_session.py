@@ -0,0 +1,16 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Status codes worth one more try: rate limiting and transient upstream failures
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def make_session(pool_size: int = 32) -> requests.Session:
+    """Keep-alive session with one HTTPS connection pool (with retries) for every outbound call."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=RETRY_STATUSES),
+    ))
+    return session
@@ -12,16 +12,19 @@ Central FastAPI entry point connecting all AI-driven modules:
 """
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-import os, json, tempfile
+import os, asyncio, tempfile
+from contextlib import asynccontextmanager
+import orjson
 from pathlib import Path
 
 # Import local modules
 from parser_engine import parse_docx_file, parse_pdf_file
 from recommender_planner import generate_study_plan
-from question_bank_builder import build_question_bank
+from question_bank_builder import build_question_bank_async
+from edu_content_api import aclose_client
 from research_assistant import research_topic
 from performance_engine import analyze_performance
 
@@ -34,10 +37,18 @@ load_dotenv()
 # ===============================================================
 # Initialize FastAPI App
 # ===============================================================
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    # The content fetchers share one HTTP client for the life of the server
+    await aclose_client()
+
 app = FastAPI(
+    lifespan=lifespan,
     title="SmartLearningAI Backend",
     version="2.0",
     description="Unified AI backend for SmartLearningAI Android App",
+    default_response_class=ORJSONResponse,
 )
 
 # Allow all origins for dev (restrict later)
@@ -50,6 +61,10 @@ app.add_middleware(
 )
 
 
+# Endpoint handlers below run the blocking parsers, the study planner, research
+# and analytics via asyncio.to_thread so the event loop keeps serving requests.
+# Question fetching is natively async and runs on the loop over the shared client.
+
 # ===============================================================
 # Root & Health
 # ===============================================================
@@ -66,6 +81,8 @@ async def health_check():
 # ===============================================================
 # 1️⃣ PARSER ENDPOINT (DOCX/PDF)
 # ===============================================================
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
 @app.post("/api/parse")
 async def parse_outline(file: UploadFile = File(...)):
     """Uploads a course outline (.docx or .pdf) and returns structured JSON."""
@@ -74,19 +91,21 @@ async def parse_outline(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Only .docx and .pdf files supported")
 
     try:
+        # Stream the upload to disk in 1 MiB chunks instead of buffering it whole
         with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            contents = await file.read()
-            tmp.write(contents)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                tmp.write(chunk)
             tmp.flush()
             temp_path = tmp.name
 
-        parsed_data = parse_docx_file(temp_path) if ext == ".docx" else parse_pdf_file(temp_path)
-        Path("output.json").write_text(json.dumps(parsed_data, indent=4), encoding="utf-8")
+        parser = parse_docx_file if ext == ".docx" else parse_pdf_file
+        parsed_data = await asyncio.to_thread(parser, temp_path)
+        Path("output.json").write_bytes(orjson.dumps(parsed_data, option=orjson.OPT_INDENT_2))
 
         # ✅ Log the JSON output
         log_json("parse_outline", parsed_data)
 
-        return JSONResponse(content={"status": "ok", "data": parsed_data})
+        return ORJSONResponse({"status": "ok", "data": parsed_data})
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse file: {e}")
@@ -107,12 +126,12 @@ async def generate_plan():
     Requires 'output.json' (from parser) to exist.
     """
     try:
-        plan = generate_study_plan()
+        plan = await asyncio.to_thread(generate_study_plan)
 
         # ✅ Log the JSON output
         log_json("generate_study_plan", plan)
 
-        return JSONResponse(content={"status": "ok", "data": plan})
+        return ORJSONResponse({"status": "ok", "data": plan})
     except FileNotFoundError:
         raise HTTPException(status_code=400, detail="Please parse a course outline first.")
     except Exception as e:
@@ -126,13 +145,17 @@ async def generate_plan():
 async def build_questions():
     """Builds a question bank based on study_plan.json."""
     try:
-        build_question_bank()
-        data = json.loads(Path("question_bank.json").read_text(encoding="utf-8"))
+        # Fetches run on this event loop over the shared client
+        data = await build_question_bank_async()
+        if data is None:
+            raise FileNotFoundError("study_plan.json")
 
         # ✅ Log the JSON output
         log_json("build_question_bank", data)
 
-        return JSONResponse(content={"status": "ok", "data": data})
+        return ORJSONResponse({"status": "ok", "data": data})
+    except FileNotFoundError:
+        raise HTTPException(status_code=400, detail="Please generate a study plan first.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to build question bank: {e}")
 
@@ -147,12 +170,12 @@ async def research(query: str = Form(...)):
     Example: {"query": "Define artificial intelligence"}
     """
     try:
-        result = research_topic(query)
+        result = await asyncio.to_thread(research_topic, query)
 
         # ✅ Log the JSON output
         log_json("research_assistant", result)
 
-        return JSONResponse(content={"status": "ok", "data": result})
+        return ORJSONResponse({"status": "ok", "data": result})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Research failed: {e}")
 
@@ -164,12 +187,12 @@ async def research(query: str = Form(...)):
 async def performance():
     """Analyzes readiness_scores.json and returns performance metrics."""
     try:
-        report = analyze_performance()
+        report = await asyncio.to_thread(analyze_performance)
 
         # ✅ Log the JSON output
         log_json("performance_analytics", report)
 
-        return JSONResponse(content={"status": "ok", "data": report})
+        return ORJSONResponse({"status": "ok", "data": report})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to analyze performance: {e}")
 
@@ -8,16 +8,20 @@ Simple FastAPI parser microservice for SmartLearningAI.
 """
 
 from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from docx import Document
 from pathlib import Path
+import asyncio
+import shutil
 import tempfile
+import zipfile
 import json
+import re
+from lxml import etree
 import fitz  # PyMuPDF for PDF support
 
 
-app = FastAPI(title="SmartLearningAI Parser", version="1.0")
+app = FastAPI(title="SmartLearningAI Parser", version="1.0", default_response_class=ORJSONResponse)
 
 # Allow all origins for now (you can restrict later)
 app.add_middleware(
@@ -30,12 +34,41 @@ app.add_middleware(
 
 
 # --------------------------
-# DOCX PARSER
+# KEYWORD DISPATCH
 # --------------------------
-def parse_docx_file(path):
-    doc = Document(path)
+# One compiled alternation finds every outline keyword on a line in a single scan.
+# Each keyword sits in a zero-width lookahead, so matches never consume text and
+# overlapping keywords ("purpose of the course code") are all found, as the
+# original per-keyword `in` tests did. Group names are the output field they
+# fill ("week" feeds weekly_topics).
+FIELD_PATTERNS = re.compile(
+    r"(?=(?P<course_code>course code))|(?=(?P<course_name>course name))|(?=(?P<prerequisite>prerequisite))"
+    r"|(?=(?P<credit_hours>credit))|(?=(?P<lecturer>lecturer))|(?=(?P<email>email))"
+    r"|(?=(?P<purpose>purpose of the course))|(?=(?P<objectives>objective))"
+    r"|(?=(?P<assessment>course assessment))|(?=(?P<core_reading>core reading))"
+    r"|(?=(?P<references>recommended reference))|(?=(?P<week>^week))",
+    re.IGNORECASE,
+)
+
+# Priority order when a line mentions several keywords
+TABLE_FIELDS = ("course_code", "course_name", "prerequisite", "credit_hours", "lecturer", "email", "week")
+PARAGRAPH_FIELDS = ("purpose", "objectives", "assessment", "core_reading", "references")
+PDF_FIELDS = ("course_code", "course_name", "prerequisite", "credit_hours", "lecturer", "email",
+              "purpose", "objectives", "week", "assessment", "core_reading", "references")
+
+
+def find_fields(text):
+    """Names of all keyword groups in text, found case-insensitively without lowercasing it."""
+    return {m.lastgroup for m in FIELD_PATTERNS.finditer(text)}
+
+
+def match_fields(found, fields):
+    """Return the found keyword fields in the given priority order."""
+    return [f for f in fields if f in found] if found else []
+
 
-    data = {
+def empty_outline():
+    return {
         "course_code": None,
         "course_name": None,
         "prerequisite": None,
@@ -50,119 +83,222 @@ def parse_docx_file(path):
         "references": None
     }
 
-    # --- Extract from tables ---
-    for table in doc.tables:
-        for row in table.rows:
-            if len(row.cells) >= 2:
-                key = row.cells[0].text.strip().lower()
-                val = row.cells[1].text.strip()
-
-                if "course code" in key:
-                    data["course_code"] = val
-                elif "course name" in key:
-                    data["course_name"] = val
-                elif "prerequisite" in key:
-                    data["prerequisite"] = val
-                elif "credit" in key:
-                    data["credit_hours"] = val
-                elif "lecturer" in key:
-                    data["lecturer"] = val
-                elif "email" in key:
-                    data["email"] = val
-                elif key.startswith("week"):
-                    data["weekly_topics"].append(f"{row.cells[0].text.strip()} {val}")
 
-    # --- Extract from paragraphs ---
-    paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+# --------------------------
+# DOCX PARSER
+# --------------------------
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_BODY, W_P, W_TBL, W_TR, W_TC = (W_NS + t for t in ("body", "p", "tbl", "tr", "tc"))
+W_T, W_TAB, W_BR, W_CR = (W_NS + t for t in ("t", "tab", "br", "cr"))
+
+
+def paragraph_text(p):
+    """Text of a w:p element, with tabs and line breaks rendered like python-docx."""
+    parts = []
+    for node in p.iter(W_T, W_TAB, W_BR, W_CR):
+        if node.tag == W_T:
+            parts.append(node.text or "")
+        elif node.tag == W_TAB:
+            parts.append("\t")
+        elif node.tag == W_CR or node.get(W_NS + "type", "textWrapping") == "textWrapping":
+            parts.append("\n")
+    return "".join(parts)
+
+
+def table_rows(tbl):
+    """Cell texts per row; a cell spanning several grid columns is repeated, as in python-docx."""
+    for tr in tbl.iterfind(W_TR):
+        cells = []
+        for tc in tr.iterfind(W_TC):
+            text = "\n".join(paragraph_text(p) for p in tc.iterfind(W_P))
+            span = tc.find(f"{W_NS}tcPr/{W_NS}gridSpan")
+            cells.extend([text] * int(span.get(W_NS + "val", 1) if span is not None else 1))
+        yield cells
+
+
+def iter_docx_blocks(path):
+    """Stream top-level ("paragraph", text) and ("table", rows) blocks out of word/document.xml."""
+    with zipfile.ZipFile(path) as z, z.open("word/document.xml") as f:
+        for _, el in etree.iterparse(f, events=("end",), tag=(W_P, W_TBL)):
+            parent = el.getparent()
+            if parent is None or parent.tag != W_BODY:
+                continue  # paragraphs inside tables are read with their table
+            if el.tag == W_P:
+                yield "paragraph", paragraph_text(el)
+            else:
+                yield "table", list(table_rows(el))
+            el.clear()
+            while el.getprevious() is not None:
+                del parent[0]
 
-    for i, p in enumerate(paragraphs):
-        lower = p.lower()
 
-        if "purpose of the course" in lower and i + 1 < len(paragraphs):
-            data["purpose"] = paragraphs[i + 1]
+def parse_docx_file(path):
+    data = empty_outline()
+    paragraphs = []
+
+    for kind, block in iter_docx_blocks(path):
+        if kind == "paragraph":
+            if block.strip():
+                paragraphs.append(block.strip())
+            continue
+
+        # --- Extract from tables ---
+        for cells in block:
+            if len(cells) >= 2:
+                key = cells[0].strip()
+                val = cells[1].strip()
+                fields = match_fields(find_fields(key), TABLE_FIELDS)
+                if not fields:
+                    continue
+                if fields[0] == "week":
+                    data["weekly_topics"].append(f"{key} {val}")
+                else:
+                    data[fields[0]] = val
 
-        elif "objective" in lower and i + 1 < len(paragraphs):
-            data["objectives"] = paragraphs[i + 1]
+    # --- Extract from paragraphs ---
+    assessment = None  # paragraphs since the last "course assessment", until "core reading"
+
+    def next_paragraph(field):
+        def handle(i):
+            if i + 1 >= len(paragraphs):
+                return False
+            data[field] = paragraphs[i + 1]
+            return True
+        return handle
+
+    def start_assessment(i):
+        nonlocal assessment
+        assessment = []
+        return True
+
+    dispatch = {
+        "purpose": next_paragraph("purpose"),
+        "objectives": next_paragraph("objectives"),
+        "assessment": start_assessment,
+        "core_reading": next_paragraph("core_reading"),
+        "references": next_paragraph("references"),
+    }
 
-        elif "course assessment" in lower:
-            collect = []
-            j = i + 1
-            while j < len(paragraphs) and "core reading" not in paragraphs[j].lower():
-                collect.append(paragraphs[j])
-                j += 1
-            data["assessment"] = "\n".join(collect)
+    # Single linear pass: the assessment section is collected as its paragraphs go by
+    for i, p in enumerate(paragraphs):
+        found = find_fields(p)
 
-        elif "core reading" in lower and i + 1 < len(paragraphs):
-            data["core_reading"] = paragraphs[i + 1]
+        if assessment is not None:
+            if "core_reading" in found:
+                data["assessment"] = "\n".join(assessment)
+                assessment = None
+            else:
+                assessment.append(p)
 
-        elif "recommended reference" in lower and i + 1 < len(paragraphs):
-            data["references"] = paragraphs[i + 1]
+        for field in match_fields(found, PARAGRAPH_FIELDS):
+            if dispatch[field](i):
+                break
 
+    if assessment is not None:
+        data["assessment"] = "\n".join(assessment)
     return data
 
 
 # --------------------------
 # PDF PARSER
 # --------------------------
+# Fields set at most once per outline; once all are found the rest of the PDF can be skipped
+SINGLE_FIELDS = tuple(f for f in PDF_FIELDS if f != "week")
+
+
+def iter_pdf_lines(doc):
+    """Yield (page_number, line) for each non-blank line, extracting pages only as needed."""
+    for page_no, page in enumerate(doc):
+        # Blocks are (x0, y0, x1, y1, text, block_no, block_type); type 1 is an image
+        for block in page.get_text("blocks"):
+            if block[6] != 0:
+                continue
+            for t in block[4].splitlines():
+                s = t.strip()
+                if s:
+                    yield page_no, s
+
+
 def parse_pdf_file(path):
-    """Convert PDF text into a temporary DOCX-like structure."""
-    doc = fitz.open(path)
-    text_lines = []
-    for page in doc:
-        text = page.get_text("text")
-        if text:
-            text_lines.extend([t.strip() for t in text.splitlines() if t.strip()])
-    doc.close()
+    """Convert PDF text into a temporary DOCX-like structure.
 
+    Lines are streamed page by page; once weekly topics have been found, parsing
+    stops after the first page that leaves every single-valued field filled
+    without adding another topic.
+    """
     # simple heuristic: simulate the same logic used for docx
-    data = {
-        "course_code": None,
-        "course_name": None,
-        "prerequisite": None,
-        "credit_hours": None,
-        "lecturer": None,
-        "email": None,
-        "purpose": None,
-        "objectives": None,
-        "weekly_topics": [],
-        "assessment": None,
-        "core_reading": None,
-        "references": None
+    data = empty_outline()
+    assessment = None  # lines since the last "course assessment", until "core reading"
+
+    def after_colon(field):
+        def handle(line, nxt):
+            data[field] = line.split(":")[-1].strip()
+            return True
+        return handle
+
+    def next_line(field):
+        def handle(line, nxt):
+            if nxt is None:
+                return False
+            data[field] = nxt
+            return True
+        return handle
+
+    def week(line, nxt):
+        data["weekly_topics"].append(line)
+        return True
+
+    def start_assessment(line, nxt):
+        nonlocal assessment
+        assessment = []
+        return True
+
+    dispatch = {
+        "course_code": after_colon("course_code"),
+        "course_name": after_colon("course_name"),
+        "prerequisite": after_colon("prerequisite"),
+        "credit_hours": after_colon("credit_hours"),
+        "lecturer": after_colon("lecturer"),
+        "email": after_colon("email"),
+        "purpose": next_line("purpose"),
+        "objectives": next_line("objectives"),
+        "week": week,
+        "assessment": start_assessment,
+        "core_reading": next_line("core_reading"),
+        "references": next_line("references"),
     }
 
-    for i, line in enumerate(text_lines):
-        lower = line.lower()
-
-        if "course code" in lower:
-            data["course_code"] = line.split(":")[-1].strip()
-        elif "course name" in lower:
-            data["course_name"] = line.split(":")[-1].strip()
-        elif "prerequisite" in lower:
-            data["prerequisite"] = line.split(":")[-1].strip()
-        elif "credit" in lower:
-            data["credit_hours"] = line.split(":")[-1].strip()
-        elif "lecturer" in lower:
-            data["lecturer"] = line.split(":")[-1].strip()
-        elif "email" in lower:
-            data["email"] = line.split(":")[-1].strip()
-        elif "purpose of the course" in lower and i + 1 < len(text_lines):
-            data["purpose"] = text_lines[i + 1]
-        elif "objective" in lower and i + 1 < len(text_lines):
-            data["objectives"] = text_lines[i + 1]
-        elif lower.startswith("week"):
-            data["weekly_topics"].append(line)
-        elif "course assessment" in lower:
-            collect = []
-            j = i + 1
-            while j < len(text_lines) and "core reading" not in text_lines[j].lower():
-                collect.append(text_lines[j])
-                j += 1
-            data["assessment"] = "\n".join(collect)
-        elif "core reading" in lower and i + 1 < len(text_lines):
-            data["core_reading"] = text_lines[i + 1]
-        elif "recommended reference" in lower and i + 1 < len(text_lines):
-            data["references"] = text_lines[i + 1]
-
+    with fitz.open(path) as doc:
+        lines = iter_pdf_lines(doc)
+        cur = next(lines, None)
+        page_topics = 0
+        while cur is not None:
+            nxt = next(lines, None)
+            page_no, line = cur
+            found = find_fields(line)
+
+            if assessment is not None:
+                if "core_reading" in found:
+                    data["assessment"] = "\n".join(assessment)
+                    assessment = None
+                else:
+                    assessment.append(line)
+
+            for field in match_fields(found, PDF_FIELDS):
+                if dispatch[field](line, nxt[1] if nxt else None):
+                    break
+
+            if nxt is None or nxt[0] != page_no:  # end of page
+                topics = len(data["weekly_topics"])
+                # Header fields often precede the schedule, so never stop before it starts
+                if (topics and topics == page_topics and assessment is None
+                        and all(data[f] is not None for f in SINGLE_FIELDS)):
+                    break
+                page_topics = topics
+            cur = nxt
+
+    if assessment is not None:
+        data["assessment"] = "\n".join(assessment)
     return data
 
 
@@ -178,18 +314,17 @@ async def parse_outline(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Only .docx and .pdf files supported")
 
     try:
+        # Copy straight from the spooled upload file, 1 MiB at a time, off the event loop
         with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            contents = await file.read()
-            tmp.write(contents)
+            await file.seek(0)
+            await asyncio.to_thread(shutil.copyfileobj, file.file, tmp, 1 << 20)
             tmp.flush()
             path = tmp.name
 
-        if ext == ".docx":
-            parsed = parse_docx_file(path)
-        else:
-            parsed = parse_pdf_file(path)
+        parser = parse_docx_file if ext == ".docx" else parse_pdf_file
+        parsed = await asyncio.to_thread(parser, path)
 
-        return JSONResponse(content={"status": "ok", "data": parsed})
+        return ORJSONResponse({"status": "ok", "data": parsed})
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse file: {e}")
@@ -1,14 +1,51 @@
-import json
-import numpy as np
+import orjson
 from datetime import datetime
 from pathlib import Path
 
+# Optional: numba-compiled reduction for very long score histories.
+# numba is imported and the kernel compiled on first use (see _compiled_reduce), not at import:
+# main.py imports this module and most histories never reach NUMBA_MIN_SCORES.
+def _reduce_scores(arr):
+    total = 0.0
+    mn = arr[0]
+    mx = arr[0]
+    imn = 0
+    imx = 0
+    for i in range(arr.shape[0]):
+        v = arr[i]
+        total += v
+        if v < mn:
+            mn = v
+            imn = i
+        if v > mx:
+            mx = v
+            imx = i
+    return total / arr.shape[0], mn, mx, imn, imx
+
+_reduce_scores_jit = None
+NUMBA_AVAILABLE = None  # unknown until a history reaches NUMBA_MIN_SCORES
+
+def _compiled_reduce():
+    """Return the numba-compiled _reduce_scores, or None when numba is not installed."""
+    global _reduce_scores_jit, NUMBA_AVAILABLE
+    if NUMBA_AVAILABLE is None:
+        try:
+            from numba import njit
+            _reduce_scores_jit = njit("Tuple((f8,f8,f8,i8,i8))(f8[::1])", cache=True)(_reduce_scores)
+            NUMBA_AVAILABLE = True
+        except Exception:
+            NUMBA_AVAILABLE = False
+    return _reduce_scores_jit
+
+# Below this many scores the plain Python loop beats the JIT call overhead
+NUMBA_MIN_SCORES = 256
+
 def load_readiness_scores(file_path="readiness_scores.json"):
     path = Path(file_path)
     if not path.exists():
         return {}
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = orjson.loads(path.read_bytes())
         # ✅ Extract only week_scores if present
         if isinstance(data, dict) and "week_scores" in data:
             return data["week_scores"]
@@ -29,20 +66,30 @@ def calculate_metrics(readiness):
     # Convert keys to str/int and values to float
     scores = {str(k): float(v) for k, v in readiness.items() if isinstance(v, (int, float, str))}
 
-    weeks = list(scores.keys())
-    values = np.array(list(scores.values()), dtype=float)
-
-    avg_score = float(np.mean(values))
-    max_score = float(np.max(values))
-    min_score = float(np.min(values))
+    # Single pass for sum/min/max; first occurrence wins ties, like np.argmax/argmin
+    reduce_scores = _compiled_reduce() if len(scores) >= NUMBA_MIN_SCORES else None
+    if reduce_scores is not None:
+        import numpy as np
+        weeks = list(scores)
+        values = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+        avg_score, min_score, max_score, imin, imax = reduce_scores(values)
+        best_week, worst_week = weeks[imax], weeks[imin]
+    else:
+        total = 0.0
+        max_score, min_score = float("-inf"), float("inf")
+        best_week = worst_week = None
+        for week, value in scores.items():
+            total += value
+            if value > max_score:
+                max_score, best_week = value, week
+            if value < min_score:
+                min_score, worst_week = value, week
+        avg_score = total / len(scores)
     trend = scores
 
     # Simple readiness metric
     exam_readiness = round((avg_score + (0.1 * max_score)) / 1.1, 2)
 
-    best_week = weeks[np.argmax(values)]
-    worst_week = weeks[np.argmin(values)]
-
     metrics = {
         "average_score": round(avg_score, 2),
         "best_week": best_week,
@@ -69,7 +116,7 @@ def analyze_performance(file_path="readiness_scores.json"):
         print(f"{k}: {v}")
     print("==========================")
 
-    Path("performance_report.json").write_text(json.dumps(report, indent=4))
+    Path("performance_report.json").write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
     return report
 
 
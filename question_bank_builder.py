@@ -1,7 +1,8 @@
-import json
+import orjson
+import asyncio
 from pathlib import Path
 from datetime import datetime
-from edu_content_api import fetch_questions_for_topic
+from edu_content_api import aclose_client, fetch_questions_for_topic_async
 
 # ===============================================================
 # FILE PATHS
@@ -9,17 +10,23 @@ from edu_content_api import fetch_questions_for_topic
 STUDY_PLAN_PATH = Path("study_plan.json")
 QUESTION_BANK_PATH = Path("question_bank.json")
 
+# ===============================================================
+# CONCURRENT FETCH
+# ===============================================================
+async def fetch_all_weeks(weeks):
+    return await asyncio.gather(*(fetch_questions_for_topic_async(w["topic"]) for w in weeks))
+
 # ===============================================================
 # MAIN BUILDER FUNCTION
 # ===============================================================
-def build_question_bank():
+async def build_question_bank_async():
+    """Build question_bank.json on the caller's event loop (reuses the shared HTTP client)."""
     # Load study plan
     if not STUDY_PLAN_PATH.exists():
         print("[ERROR] study_plan.json not found.")
         return
     
-    with open(STUDY_PLAN_PATH, "r") as f:
-        study_plan = json.load(f)
+    study_plan = orjson.loads(await asyncio.to_thread(STUDY_PLAN_PATH.read_bytes))
 
     print(f"[INFO] Building Question Bank for course: {study_plan['course_name']}")
 
@@ -31,14 +38,15 @@ def build_question_bank():
         "weeks": []
     }
 
-    # Iterate through all weeks
+    # Fetch all weeks concurrently; results come back in week order
     for week in study_plan["weeks"]:
+        print(f"[INFO] Fetching questions for Week {week['week']}: {week['topic']}")
+    all_questions = await fetch_all_weeks(study_plan["weeks"])
+
+    for week, questions in zip(study_plan["weeks"], all_questions):
         topic = week["topic"]
         week_num = week["week"]
 
-        print(f"\n[INFO] Fetching questions for Week {week_num}: {topic}")
-        questions = fetch_questions_for_topic(topic)
-
         week_entry = {
             "week": week_num,
             "topic": topic,
@@ -47,11 +55,20 @@ def build_question_bank():
         question_bank["weeks"].append(week_entry)
 
     # Save the result
-    with open(QUESTION_BANK_PATH, "w", encoding="utf-8") as f:
-        json.dump(question_bank, f, indent=4, ensure_ascii=False)
+    await asyncio.to_thread(QUESTION_BANK_PATH.write_bytes, orjson.dumps(question_bank, option=orjson.OPT_INDENT_2))
 
     print(f"\n✅ Question bank generated successfully → {QUESTION_BANK_PATH}")
     print(f"Total weeks processed: {len(question_bank['weeks'])}")
+    return question_bank
+
+def build_question_bank():
+    """Blocking entry point for scripts: runs the builder in its own event loop."""
+    async def run():
+        try:
+            return await build_question_bank_async()
+        finally:
+            await aclose_client()
+    return asyncio.run(run())
 
 # ===============================================================
 # RUN DIRECTLY
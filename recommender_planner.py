@@ -1,7 +1,9 @@
 import os
-import json
-import requests
-from datetime import datetime, timedelta
+import orjson
+from http_session import make_session
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -15,6 +17,10 @@ GOOGLE_BOOKS_API = os.getenv("GOOGLE_BOOKS_API", "https://www.googleapis.com/boo
 GOOGLE_SEARCH_API = os.getenv("GOOGLE_SEARCH_API", "https://www.googleapis.com/customsearch/v1")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 CUSTOM_SEARCH_ENGINE_ID = os.getenv("CUSTOM_SEARCH_ENGINE_ID")
+MAX_FETCH_WORKERS = 16
+API_CACHE_SIZE = 1024
+
+SESSION = make_session()
 
 # ===============================================================
 # 2️⃣ Helper functions
@@ -24,64 +30,76 @@ def load_parsed_outline():
     path = Path("output.json")
     if not path.exists():
         raise FileNotFoundError("Missing 'output.json'. Please upload or generate it first.")
-    return json.loads(path.read_text(encoding="utf-8"))
+    return orjson.loads(path.read_bytes())
+
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+
+def cached_lookup(fetch):
+    """Memoize a lookup per (normalized query, day); errors return [] and are not cached."""
+    cached = lru_cache(maxsize=API_CACHE_SIZE)(lambda query, day: tuple(fetch(query)))
 
+    @wraps(fetch)
+    def wrapper(query):
+        try:
+            return list(cached(normalize_query(query), date.today().toordinal()))
+        except Exception:
+            return []
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
 
+
+@cached_lookup
 def get_youtube_videos(query):
     """Fetch 3 educational YouTube videos related to the topic."""
     if not YOUTUBE_API_KEY:
         return []
-    try:
-        url = "https://www.googleapis.com/youtube/v3/search"
-        params = {
-            "part": "snippet",
-            "q": query,
-            "maxResults": 3,
-            "type": "video",
-            "key": YOUTUBE_API_KEY,
-        }
-        r = requests.get(url, params=params, timeout=8)
-        r.raise_for_status()
-        data = r.json()
-        return [
-            f"https://www.youtube.com/watch?v={item['id']['videoId']}"
-            for item in data.get("items", [])
-        ]
-    except Exception:
-        return []
+    url = "https://www.googleapis.com/youtube/v3/search"
+    params = {
+        "part": "snippet",
+        "q": query,
+        "maxResults": 3,
+        "type": "video",
+        "key": YOUTUBE_API_KEY,
+    }
+    r = SESSION.get(url, params=params, timeout=8)
+    r.raise_for_status()
+    data = r.json()
+    return [
+        f"https://www.youtube.com/watch?v={item['id']['videoId']}"
+        for item in data.get("items", [])
+    ]
 
 
+@cached_lookup
 def get_books(query):
     """Fetch 3 recommended book titles from Google Books."""
-    try:
-        r = requests.get(GOOGLE_BOOKS_API + query, timeout=8)
-        r.raise_for_status()
-        data = r.json()
-        return [
-            item["volumeInfo"]["title"]
-            for item in data.get("items", [])[:3]
-            if "volumeInfo" in item
-        ]
-    except Exception:
-        return []
+    r = SESSION.get(GOOGLE_BOOKS_API + query, timeout=8)
+    r.raise_for_status()
+    data = r.json()
+    return [
+        item["volumeInfo"]["title"]
+        for item in data.get("items", [])[:3]
+        if "volumeInfo" in item
+    ]
 
 
+@cached_lookup
 def get_articles(query):
     """Fetch 3 educational article links from Google Custom Search."""
     if not GOOGLE_API_KEY or not CUSTOM_SEARCH_ENGINE_ID:
         return []
-    try:
-        params = {
-            "key": GOOGLE_API_KEY,
-            "cx": CUSTOM_SEARCH_ENGINE_ID,
-            "q": query,
-        }
-        r = requests.get(GOOGLE_SEARCH_API, params=params, timeout=8)
-        r.raise_for_status()
-        data = r.json()
-        return [item["link"] for item in data.get("items", [])[:3]]
-    except Exception:
-        return []
+    params = {
+        "key": GOOGLE_API_KEY,
+        "cx": CUSTOM_SEARCH_ENGINE_ID,
+        "q": query,
+    }
+    r = SESSION.get(GOOGLE_SEARCH_API, params=params, timeout=8)
+    r.raise_for_status()
+    data = r.json()
+    return [item["link"] for item in data.get("items", [])[:3]]
 
 
 # ===============================================================
@@ -101,12 +119,20 @@ def generate_study_plan():
         for i in range(len(parsed_data["weekly_topics"]))
     ]
 
+    topics = parsed_data["weekly_topics"]
+    queries = [topic.split(":")[-1].strip() for topic in topics]
+
+    # All lookups are network-bound, so run every (week, source) pair at once
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as ex:
+        books_f = [ex.submit(get_books, q) for q in queries]
+        videos_f = [ex.submit(get_youtube_videos, q) for q in queries]
+        articles_f = [ex.submit(get_articles, q) for q in queries]
+
     weeks_plan = []
-    for i, topic in enumerate(parsed_data["weekly_topics"]):
-        query = topic.split(":")[-1].strip()
-        books = get_books(query)
-        videos = get_youtube_videos(query)
-        articles = get_articles(query)
+    for i, (topic, query) in enumerate(zip(topics, queries)):
+        books = books_f[i].result()
+        videos = videos_f[i].result()
+        articles = articles_f[i].result()
 
         plan = {
             "week": i + 1,
@@ -129,7 +155,7 @@ def generate_study_plan():
         "weeks": weeks_plan,
     }
 
-    Path("study_plan.json").write_text(json.dumps(final_plan, indent=4), encoding="utf-8")
+    Path("study_plan.json").write_bytes(orjson.dumps(final_plan, option=orjson.OPT_INDENT_2))
     print("✅ Study plan created successfully → study_plan.json")
     return final_plan
 
@@ -140,6 +166,6 @@ def generate_study_plan():
 if __name__ == "__main__":
     try:
         plan = generate_study_plan()
-        print(json.dumps(plan, indent=2))
+        print(orjson.dumps(plan, option=orjson.OPT_INDENT_2).decode())
     except Exception as e:
         print(f"❌ Failed to generate study plan: {e}")
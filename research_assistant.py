@@ -10,12 +10,21 @@ Optimized for Render: lightweight summarization via Hugging Face API.
 """
 
 import os
-import re
-import requests
+import hashlib
+import threading
+from http_session import make_session
 from bs4 import BeautifulSoup
+from collections import OrderedDict
 from datetime import datetime
 from dotenv import load_dotenv
 
+# Optional: selectolax's C HTML parser, much faster than BeautifulSoup's html.parser
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except Exception:
+    SELECTOLAX_AVAILABLE = False
+
 load_dotenv()
 
 
@@ -24,6 +33,10 @@ load_dotenv()
 # ==========================================================
 HF_API_KEY = os.getenv("HUGGINGFACE_API_KEY")
 HF_SUMMARY_URL = "https://api-inference.huggingface.co/models/facebook/bart-large-cnn"
+# Texts this short are already under the model's min_length; summarizing them is a wasted round-trip
+SUMMARY_MIN_WORDS = 40
+
+SESSION = make_session()
 
 
 # ==========================================================
@@ -31,27 +44,64 @@ HF_SUMMARY_URL = "https://api-inference.huggingface.co/models/facebook/bart-larg
 # ==========================================================
 def clean_text(text: str) -> str:
     """Clean up whitespace and extra characters."""
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    # str.split() treats the same characters as whitespace as re's \s
+    return " ".join(text.split()) if text else ""
+
+
+# Successful HF summaries, keyed by a 16-byte blake2b digest of the input (LRU order).
+# API handlers run research_topic in worker threads, so every cache access holds the lock.
+SUMMARY_CACHE_SIZE = 4096
+_summary_cache = OrderedDict()
+_summary_lock = threading.Lock()
+
+
+def hf_summarize(text: str):
+    """Return the Hugging Face summary of text, or None if the API call fails."""
+    try:
+        headers = {"Authorization": f"Bearer {HF_API_KEY}"}
+        payload = {"inputs": text, "parameters": {"max_length": 120, "min_length": 40}}
+        res = SESSION.post(HF_SUMMARY_URL, headers=headers, json=payload, timeout=15)
+        if res.status_code == 200:
+            data = res.json()
+            if isinstance(data, list) and "summary_text" in data[0]:
+                return clean_text(data[0]["summary_text"])
+    except Exception as e:
+        print(f"[WARN] Summarizer failed: {e}")
+    return None
+
+
+def cached_hf_summarize(text: str):
+    """hf_summarize, answering repeated inputs from the LRU; failures are not cached."""
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    with _summary_lock:
+        summary = _summary_cache.get(key)
+        if summary is not None:
+            _summary_cache.move_to_end(key)
+            return summary
+
+    summary = hf_summarize(text)
+    if summary is not None:
+        with _summary_lock:
+            _summary_cache[key] = summary
+            if len(_summary_cache) > SUMMARY_CACHE_SIZE:
+                _summary_cache.popitem(last=False)
+    return summary
 
 
 def summarize_text(text: str, max_sentences: int = 3) -> str:
     """Summarize text using Hugging Face API or fallback method."""
+    text = clean_text(text)
     if not text:
         return ""
+    # Already shorter than the model's min_length: nothing to summarize
+    if text.count(" ") + 1 <= SUMMARY_MIN_WORDS:
+        return text
 
     # --- Hugging Face Summarization ---
     if HF_API_KEY:
-        try:
-            headers = {"Authorization": f"Bearer {HF_API_KEY}"}
-            payload = {"inputs": text, "parameters": {"max_length": 120, "min_length": 40}}
-            res = requests.post(HF_SUMMARY_URL, headers=headers, json=payload, timeout=15)
-            if res.status_code == 200:
-                data = res.json()
-                if isinstance(data, list) and "summary_text" in data[0]:
-                    return clean_text(data[0]["summary_text"])
-        except Exception as e:
-            print(f"[WARN] Summarizer failed: {e}")
+        summary = cached_hf_summarize(text)
+        if summary is not None:
+            return summary
 
     # --- Fallback: simple heuristic ---
     sentences = text.split(". ")
@@ -64,7 +114,7 @@ def summarize_text(text: str, max_sentences: int = 3) -> str:
 def fetch_wikipedia(query: str):
     try:
         url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{query.replace(' ', '_')}"
-        r = requests.get(url, timeout=5)
+        r = SESSION.get(url, timeout=5)
         if r.status_code == 200:
             data = r.json()
             summary = data.get("extract", "")
@@ -82,16 +132,31 @@ def fetch_wikipedia(query: str):
 # ==========================================================
 # 🔹 GeeksforGeeks Fetch
 # ==========================================================
+def find_gfg_article(html: str):
+    """Return (title, link) of the first search hit; link is None if it has no enclosing <a>."""
+    if SELECTOLAX_AVAILABLE:
+        node = HTMLParser(html).css_first("div.head")
+        if node is None:
+            return None, None
+        parent = node.parent
+        while parent is not None and parent.tag != "a":
+            parent = parent.parent
+        return node.text().strip(), parent.attributes.get("href") if parent is not None else None
+
+    article = BeautifulSoup(html, "html.parser").find("div", class_="head")
+    if article is None:
+        return None, None
+    parent = article.find_parent("a")
+    return article.text.strip(), parent.get("href") if parent is not None else None
+
+
 def fetch_gfg(query: str):
     try:
         search = "+".join(query.split())
         url = f"https://www.geeksforgeeks.org/search/?q={search}"
-        html = requests.get(url, timeout=5).text
-        soup = BeautifulSoup(html, "html.parser")
-        article = soup.find("div", class_="head")
-        if article:
-            title = article.text.strip()
-            link = article.find_parent("a")["href"]
+        html = SESSION.get(url, timeout=5).text
+        title, link = find_gfg_article(html)
+        if title is not None and link:
             return {
                 "source": "GeeksforGeeks",
                 "title": title,
@@ -106,18 +171,25 @@ def fetch_gfg(query: str):
 # ==========================================================
 # 🔹 Coursera Fetch
 # ==========================================================
+def find_coursera_title(html: str):
+    if SELECTOLAX_AVAILABLE:
+        node = HTMLParser(html).css_first("h2.card-title")
+        return node.text().strip() if node is not None else None
+    node = BeautifulSoup(html, "html.parser").select_one("h2.card-title")
+    return node.text.strip() if node is not None else None
+
+
 def fetch_coursera(query: str):
     try:
         search = "+".join(query.split())
         url = f"https://www.coursera.org/search?query={search}"
-        html = requests.get(url, timeout=5).text
-        soup = BeautifulSoup(html, "html.parser")
-        title = soup.select_one("h2.card-title")
-        if title:
+        html = SESSION.get(url, timeout=5).text
+        title = find_coursera_title(html)
+        if title is not None:
             return {
                 "source": "Coursera",
-                "title": title.text.strip(),
-                "summary": f"Coursera offers a course titled '{title.text.strip()}' related to {query}.",
+                "title": title,
+                "summary": f"Coursera offers a course titled '{title}' related to {query}.",
                 "url": url
             }
     except Exception:
@@ -131,7 +203,7 @@ def fetch_coursera(query: str):
 def fetch_books(query: str):
     try:
         url = f"https://www.googleapis.com/books/v1/volumes?q={query}"
-        data = requests.get(url, timeout=5).json()
+        data = SESSION.get(url, timeout=5).json()
         books = []
         for item in data.get("items", [])[:3]:
             vol = item.get("volumeInfo", {})
@@ -163,7 +235,7 @@ def fetch_youtube(query: str, api_key: str = None):
             "maxResults": 3,
             "type": "video"
         }
-        res = requests.get(url, params=params, timeout=5).json()
+        res = SESSION.get(url, params=params, timeout=5).json()
         results = []
         for item in res.get("items", []):
             results.append({
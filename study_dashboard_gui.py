@@ -1,56 +1,74 @@
-import json
-from datetime import datetime
+from datetime import date
+from functools import lru_cache, partial
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk
 import webbrowser
-from pathlib import Path
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import study_plan_store
+from study_plan_store import STUDY_PLAN, PROGRESS
+
+# matplotlib is imported on first chart draw (see _lazy_mpl); it dominates startup otherwise.
+# Figures are embedded via FigureCanvasTkAgg, so pyplot (and its global figure registry) is never needed.
+Figure = None
+FigureCanvasTkAgg = None
+
+def _lazy_mpl():
+    global Figure, FigureCanvasTkAgg
+    if Figure is None:
+        from matplotlib.figure import Figure as _Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as _Canvas
+        Figure, FigureCanvasTkAgg = _Figure, _Canvas
 
 # ===============================================================
 # LOAD DATA
 # ===============================================================
-with open("study_plan.json", "r") as f:
-    study_plan = json.load(f)
-
-PROGRESS_FILE = Path("progress_tracker.json")
-
-def load_progress():
-    if PROGRESS_FILE.exists():
-        with open(PROGRESS_FILE, "r") as f:
-            return json.load(f)
-    return {"user_id": "student_001", "completed_weeks": [], "completed_videos": {}, "completed_books": {}, "last_updated": None}
-
-def save_progress(progress):
-    progress["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(PROGRESS_FILE, "w") as f:
-        json.dump(progress, f, indent=4)
-
-progress = load_progress()
+study_plan = STUDY_PLAN
+progress = PROGRESS
+
+# Plan-wide totals for the overall completion figure; the plan does not change at runtime
+TOTAL_WEEKS = len(study_plan["weeks"])
+TOTAL_POSSIBLE_VIDEOS = sum(len(w["youtube_links"]) for w in study_plan["weeks"])
+TOTAL_POSSIBLE_BOOKS = sum(len(w["recommended_books"]) for w in study_plan["weeks"])
+WEEK_LABELS = [f"W{w['week']}" for w in study_plan["weeks"]]
+
+# Bumped on every save; keys the calc_progress cache so stale entries are simply never hit
+PROGRESS_VERSION = 0
+
+# Journal appends are fsynced at most once per burst of marks (trades <=500 ms of durability)
+SYNC_DEBOUNCE_MS = 500
+_sync_after_id = None
+
+def _flush_pending():
+    global _sync_after_id
+    _sync_after_id = None
+    study_plan_store.sync_progress_journal()
+
+def save_progress(progress, event):
+    global PROGRESS_VERSION, _sync_after_id
+    PROGRESS_VERSION += 1
+    study_plan_store.save_progress(progress, event)
+    if _sync_after_id is None:
+        _sync_after_id = root.after(SYNC_DEBOUNCE_MS, _flush_pending)
 
 # ===============================================================
 # HELPERS
 # ===============================================================
 def get_current_week_index():
-    today = datetime.today()
-    for i, week in enumerate(study_plan["weeks"]):
-        start = datetime.strptime(week["calendar"]["start_date"], "%b %d, %Y")
-        end = datetime.strptime(week["calendar"]["end_date"], "%b %d, %Y")
-        if start <= today <= end:
-            return i
-    return 0  # fallback
-
-def calc_progress(week):
-    wk = str(week["week"])
-    total_videos = len(week["youtube_links"])
-    total_books = len(week["recommended_books"])
-    done_videos = len(progress["completed_videos"].get(wk, []))
-    done_books = len(progress["completed_books"].get(wk, []))
-    week_done = 1 if week["week"] in progress["completed_weeks"] else 0
+    index = study_plan_store.week_index_for(study_plan, date.today())
+    return index if index is not None else 0  # fallback
+
+@lru_cache(maxsize=256)
+def _calc_progress_cached(wk_num, total_videos, total_books, version):
+    done_videos = len(progress["completed_videos"].get(wk_num, ()))
+    done_books = len(progress["completed_books"].get(wk_num, ()))
+    week_done = 1 if wk_num in progress["completed_weeks"] else 0
     total = total_videos + total_books + 1  # +1 for week completion
     completed = done_videos + done_books + week_done
     return int((completed / total) * 100) if total > 0 else 0
 
+def calc_progress(week):
+    return _calc_progress_cached(week["week"], len(week["youtube_links"]),
+                                 len(week["recommended_books"]), PROGRESS_VERSION)
+
 # ===============================================================
 # GUI SETUP
 # ===============================================================
@@ -64,64 +82,157 @@ style.configure("TButton", font=("Segoe UI", 10), padding=6)
 style.configure("TLabel", font=("Segoe UI", 10), background="#f8fafc")
 style.configure("Header.TLabel", font=("Segoe UI", 14, "bold"), background="#f8fafc")
 
+# Non-modal feedback for marks; packed before content_frame so it keeps its space at the bottom
+STATUS_CLEAR_MS = 2000
+status_var = tk.StringVar()
+ttk.Label(root, textvariable=status_var, foreground="#16a34a").pack(side="bottom", pady=(0, 8))
+_status_after_id = None
+
+def set_status(message):
+    global _status_after_id
+    status_var.set(message)
+    if _status_after_id is not None:
+        root.after_cancel(_status_after_id)
+    _status_after_id = root.after(STATUS_CLEAR_MS, status_var.set, "")
+
 content_frame = ttk.Frame(root)
 content_frame.pack(padx=15, pady=10, fill="both", expand=True)
 
 # ===============================================================
 # ANALYTICS POPUP WINDOW
 # ===============================================================
-def open_analytics_window():
+# Window, figures and artists are built once; later opens update them in place
+_analytics_cache = {"window": None, "bars": None, "canvas": None, "ax2": None, "canvas2": None,
+                    "overall_var": None, "weeks_var": None, "counts_var": None}
+
+def _build_analytics_window():
+    _lazy_mpl()
     win = tk.Toplevel(root)
     win.title("📈 SmartLearningAI Analytics")
     win.geometry("800x600")
     win.configure(bg="#f9fafc")
+    win.protocol("WM_DELETE_WINDOW", win.withdraw)
 
-    total_weeks = len(study_plan["weeks"])
-    done_weeks = len(progress["completed_weeks"])
-    total_videos = sum(len(v) for v in progress["completed_videos"].values())
-    total_books = sum(len(v) for v in progress["completed_books"].values())
+    overall_var = tk.StringVar()
+    ttk.Label(win, textvariable=overall_var, font=("Segoe UI", 12, "bold")).pack(pady=10)
 
-    # --- Calculate overall completion ---
-    total_possible_videos = sum(len(w["youtube_links"]) for w in study_plan["weeks"])
-    total_possible_books = sum(len(w["recommended_books"]) for w in study_plan["weeks"])
-    overall = ( (total_videos + total_books + done_weeks)
-                / (total_possible_videos + total_possible_books + total_weeks) ) * 100
-
-    ttk.Label(win, text=f"Overall Course Completion: {overall:.1f}%", font=("Segoe UI", 12, "bold")).pack(pady=10)
-
-    # --- Bar chart for weekly progress ---
-    week_labels = [f"W{w['week']}" for w in study_plan["weeks"]]
-    week_progress = [calc_progress(w) for w in study_plan["weeks"]]
-
-    fig, ax = plt.subplots(figsize=(8, 3))
-    ax.bar(week_labels, week_progress, color="#3b82f6")
+    # --- Bar chart for weekly progress (heights are set on each open) ---
+    fig = Figure(figsize=(8, 3))
+    ax = fig.add_subplot(111)
+    bars = ax.bar(WEEK_LABELS, [0] * len(WEEK_LABELS), color="#3b82f6")
     ax.set_ylim(0, 100)
     ax.set_title("Weekly Progress Overview")
     ax.set_xlabel("Week")
     ax.set_ylabel("Completion (%)")
 
     canvas = FigureCanvasTkAgg(fig, master=win)
-    canvas.draw()
     canvas.get_tk_widget().pack(pady=10)
 
-    # --- Books vs Videos Pie Chart ---
-    fig2, ax2 = plt.subplots(figsize=(4, 4))
+    # --- Books vs Videos Pie Chart (redrawn on each open; pies have no cheap update) ---
+    fig2 = Figure(figsize=(4, 4))
+    ax2 = fig2.add_subplot(111)
+    canvas2 = FigureCanvasTkAgg(fig2, master=win)
+    canvas2.get_tk_widget().pack(pady=10)
+
+    weeks_var = tk.StringVar()
+    counts_var = tk.StringVar()
+    ttk.Label(win, textvariable=weeks_var, font=("Segoe UI", 10)).pack(pady=5)
+    ttk.Label(win, textvariable=counts_var, font=("Segoe UI", 10)).pack()
+
+    _analytics_cache.update(window=win, bars=bars, canvas=canvas, ax2=ax2, canvas2=canvas2,
+                            overall_var=overall_var, weeks_var=weeks_var, counts_var=counts_var)
+
+# Per-week completion for the bar chart, recomputed only when PROGRESS_VERSION moves
+_cached_week_progress = None
+_cached_version = -1
+
+def open_analytics_window():
+    global _cached_week_progress, _cached_version
+    if _analytics_cache["window"] is None or not _analytics_cache["window"].winfo_exists():
+        _build_analytics_window()
+    win = _analytics_cache["window"]
+
+    done_weeks = len(progress["completed_weeks"])
+    total_videos = sum(len(v) for v in progress["completed_videos"].values())
+    total_books = sum(len(v) for v in progress["completed_books"].values())
+
+    # --- Calculate overall completion ---
+    overall = ( (total_videos + total_books + done_weeks)
+                / (TOTAL_POSSIBLE_VIDEOS + TOTAL_POSSIBLE_BOOKS + TOTAL_WEEKS) ) * 100
+
+    _analytics_cache["overall_var"].set(f"Overall Course Completion: {overall:.1f}%")
+
+    if _cached_version != PROGRESS_VERSION:
+        _cached_week_progress = [calc_progress(w) for w in study_plan["weeks"]]
+        _cached_version = PROGRESS_VERSION
+    for rect, height in zip(_analytics_cache["bars"], _cached_week_progress):
+        rect.set_height(height)
+    _analytics_cache["canvas"].draw_idle()
+
+    ax2 = _analytics_cache["ax2"]
+    ax2.clear()
     data = [total_books, total_videos]
     labels = ["Books Read", "Videos Watched"]
     colors = ["#10b981", "#f59e0b"]
     ax2.pie(data, labels=labels, autopct='%1.1f%%', startangle=90, colors=colors)
     ax2.set_title("Learning Activity Breakdown")
+    _analytics_cache["canvas2"].draw_idle()
 
-    canvas2 = FigureCanvasTkAgg(fig2, master=win)
-    canvas2.draw()
-    canvas2.get_tk_widget().pack(pady=10)
-
-    ttk.Label(win, text=f"Weeks Completed: {done_weeks}/{total_weeks}", font=("Segoe UI", 10)).pack(pady=5)
-    ttk.Label(win, text=f"Books Read: {total_books} | Videos Watched: {total_videos}", font=("Segoe UI", 10)).pack()
+    _analytics_cache["weeks_var"].set(f"Weeks Completed: {done_weeks}/{TOTAL_WEEKS}")
+    _analytics_cache["counts_var"].set(f"Books Read: {total_books} | Videos Watched: {total_videos}")
+    win.deiconify()
+    win.lift()
 
 # ===============================================================
 # CORE CONTENT RENDERING
 # ===============================================================
+# Widgets of the week on screen, so a mark only restyles its row instead of rebuilding the view
+_week_view = {"week": None, "bar": None, "progress_label": None, "book_rows": {}, "video_rows": {}}
+
+def _show_done(row):
+    label, button = row
+    label.configure(foreground="#9ca3af")
+    button.configure(state="disabled")
+
+def _refresh_week_progress():
+    progress_percent = calc_progress(_week_view["week"])
+    _week_view["progress_label"].configure(text=f"Progress: {progress_percent}%")
+    _week_view["bar"]["value"] = progress_percent
+
+# Button/link callbacks are bound per row with functools.partial, so render_week creates no closures
+def _mark_book(week, book):
+    wk = week["week"]
+    progress["completed_books"].setdefault(wk, set())
+    if book not in progress["completed_books"][wk]:
+        progress["completed_books"][wk].add(book)
+        save_progress(progress, {"op": "book", "wk": wk, "item": book})
+        set_status(f"✅ Book marked as read: {book}")
+        _show_done(_week_view["book_rows"][book])
+        _refresh_week_progress()
+
+def _mark_video(week, video):
+    wk = week["week"]
+    progress["completed_videos"].setdefault(wk, set())
+    if video not in progress["completed_videos"][wk]:
+        progress["completed_videos"][wk].add(video)
+        save_progress(progress, {"op": "video", "wk": wk, "item": video})
+        set_status(f"✅ Video marked as watched: {video}")
+        _show_done(_week_view["video_rows"][video])
+        _refresh_week_progress()
+
+def _mark_week_done(week):
+    wk_num = week["week"]
+    if wk_num not in progress["completed_weeks"]:
+        progress["completed_weeks"].append(wk_num)
+        save_progress(progress, {"op": "week", "wk": wk_num})
+        set_status(f"🎉 Week {wk_num} marked as completed!")
+        _refresh_week_progress()
+    else:
+        set_status(f"✔️ Week {wk_num} already completed.")
+
+def _open_video(video, event=None):
+    webbrowser.open(video)
+
 def render_week(week):
     for widget in content_frame.winfo_children():
         widget.destroy()
@@ -134,9 +245,14 @@ def render_week(week):
     ttk.Label(content_frame, text=f"{week['calendar']['start_date']} → {week['calendar']['end_date']}", font=("Segoe UI", 9)).pack(anchor="center", pady=(0,8))
 
     # Progress bar
-    ttk.Label(content_frame, text=f"Progress: {progress_percent}%", font=("Segoe UI", 10, "bold")).pack(anchor="center")
+    progress_label = ttk.Label(content_frame, text=f"Progress: {progress_percent}%", font=("Segoe UI", 10, "bold"))
+    progress_label.pack(anchor="center")
     bar = ttk.Progressbar(content_frame, length=300, value=progress_percent, mode="determinate")
     bar.pack(pady=(0, 15))
+    book_rows, video_rows = {}, {}
+    _week_view.update(week=week, bar=bar, progress_label=progress_label, book_rows=book_rows, video_rows=video_rows)
+    done_books = progress["completed_books"].get(wk_num, ())
+    done_videos = progress["completed_videos"].get(wk_num, ())
 
     # Study Plan
     ttk.Label(content_frame, text="🧠 Study Plan:", font=("Segoe UI", 11, "bold")).pack(anchor="w", pady=(5,0))
@@ -150,16 +266,13 @@ def render_week(week):
     for book in week["recommended_books"]:
         frame_b = ttk.Frame(content_frame)
         frame_b.pack(anchor="w", pady=2, fill="x")
-        ttk.Label(frame_b, text=f"• {book}").pack(side="left")
-        def mark_book(b=book):
-            wk = str(week["week"])
-            progress["completed_books"].setdefault(wk, [])
-            if b not in progress["completed_books"][wk]:
-                progress["completed_books"][wk].append(b)
-                save_progress(progress)
-                messagebox.showinfo("✅", f"Book marked as read: {b}")
-                render_week(week)
-        ttk.Button(frame_b, text="Mark Read", command=mark_book).pack(side="right")
+        label = ttk.Label(frame_b, text=f"• {book}")
+        label.pack(side="left")
+        button = ttk.Button(frame_b, text="Mark Read", command=partial(_mark_book, week, book))
+        button.pack(side="right")
+        book_rows[book] = (label, button)
+        if book in done_books:
+            _show_done(book_rows[book])
 
     # Videos
     ttk.Label(content_frame, text="\n🎥 Videos:", font=("Segoe UI", 11, "bold")).pack(anchor="w")
@@ -168,37 +281,26 @@ def render_week(week):
         frame_v.pack(anchor="w", pady=2, fill="x")
         link = ttk.Label(frame_v, text=f"• {video}", foreground="#0645AD", cursor="hand2")
         link.pack(side="left")
-        link.bind("<Button-1>", lambda e, v=video: webbrowser.open(v))
-        def mark_video(v=video):
-            wk = str(week["week"])
-            progress["completed_videos"].setdefault(wk, [])
-            if v not in progress["completed_videos"][wk]:
-                progress["completed_videos"][wk].append(v)
-                save_progress(progress)
-                messagebox.showinfo("✅", f"Video marked as watched: {v}")
-                render_week(week)
-        ttk.Button(frame_v, text="Mark Watched", command=mark_video).pack(side="right")
+        link.bind("<Button-1>", partial(_open_video, video))
+        button = ttk.Button(frame_v, text="Mark Watched", command=partial(_mark_video, week, video))
+        button.pack(side="right")
+        video_rows[video] = (link, button)
+        if video in done_videos:
+            _show_done(video_rows[video])
 
     # Mark Week Complete
-    def mark_week_done():
-        if wk_num not in progress["completed_weeks"]:
-            progress["completed_weeks"].append(wk_num)
-            save_progress(progress)
-            messagebox.showinfo("🎉", f"Week {wk_num} marked as completed!")
-            render_week(week)
-        else:
-            messagebox.showinfo("✔️", f"Week {wk_num} already completed.")
-    ttk.Button(content_frame, text="✅ Mark Week Completed", command=mark_week_done).pack(pady=15)
+    ttk.Button(content_frame, text="✅ Mark Week Completed", command=partial(_mark_week_done, week)).pack(pady=15)
 
 # ===============================================================
 # WEEK DROPDOWN
 # ===============================================================
 week_names = [f"Week {w['week']}: {w['topic'][:50]}..." for w in study_plan["weeks"]]
+WEEK_NAME_TO_IDX = {name: i for i, name in enumerate(week_names)}
 current_week_index = get_current_week_index()
 selected_week = tk.StringVar(value=week_names[current_week_index])
 
 def on_week_change(event=None):
-    index = week_names.index(selected_week.get())
+    index = WEEK_NAME_TO_IDX[selected_week.get()]
     render_week(study_plan["weeks"][index])
 
 ttk.Label(root, text="Select Week:", font=("Segoe UI", 10)).pack(pady=(5, 0))
@@ -0,0 +1,146 @@
+import atexit
+import orjson
+import os
+from bisect import bisect_right
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+# Shared, parse-once state for the study dashboard and the delivery engine:
+# importing this module loads study_plan.json and progress_tracker.json exactly once per process.
+
+# ===============================================================
+# STUDY PLAN
+# ===============================================================
+STUDY_PLAN_FILE = Path("study_plan.json")
+
+def load_study_plan(path=STUDY_PLAN_FILE):
+    return orjson.loads(path.read_bytes())
+
+def build_week_ranges(plan):
+    """Return ([(start_ordinal, end_ordinal, week_index)] sorted by start, [start_ordinal, ...])."""
+    ranges = sorted(
+        (datetime.strptime(w["calendar"]["start_date"], "%b %d, %Y").toordinal(),
+         datetime.strptime(w["calendar"]["end_date"], "%b %d, %Y").toordinal(), i)
+        for i, w in enumerate(plan["weeks"])
+    )
+    return ranges, [r[0] for r in ranges]
+
+# Date ranges of the last plan looked up: (plan, ranges, starts). Holding only the
+# latest plan means no stale entries and nothing kept alive beyond it.
+_week_ranges = None
+
+@lru_cache(maxsize=8)
+def _week_index_for(day):
+    _, ranges, starts = _week_ranges
+    pos = bisect_right(starts, day) - 1
+    if pos >= 0 and day <= ranges[pos][1]:
+        return ranges[pos][2]
+    return None
+
+def week_index_for(plan, day):
+    """Index into plan["weeks"] of the week whose dates contain day, or None."""
+    global _week_ranges
+    if _week_ranges is None or _week_ranges[0] is not plan:
+        _week_ranges = (plan, *build_week_ranges(plan))
+        _week_index_for.cache_clear()  # cached days belong to the previous plan
+    return _week_index_for(day.toordinal())
+
+# ===============================================================
+# PROGRESS TRACKER
+# ===============================================================
+PROGRESS_FILE = Path("progress_tracker.json")
+# Append-only log of marks (one JSON event per line), folded into PROGRESS_FILE on compaction
+PROGRESS_JOURNAL = Path("progress_tracker.log")
+PROGRESS_BUFFER_SIZE = 65536  # one write() for a typical snapshot
+JOURNAL_COMPACT_EVERY = 64
+
+_journal = None
+_journal_events = 0
+
+def _json_default(o):
+    if isinstance(o, set):
+        return sorted(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+def apply_progress_event(progress, event):
+    """Replay one journal event ({"op": "week"|"video"|"book", "wk": ..., "item": ...})."""
+    if event["op"] == "week":
+        if event["wk"] not in progress["completed_weeks"]:
+            progress["completed_weeks"].append(event["wk"])
+    else:
+        key = "completed_videos" if event["op"] == "video" else "completed_books"
+        progress[key].setdefault(int(event["wk"]), set()).add(event["item"])
+    if "ts" in event:
+        progress["last_updated"] = event["ts"]
+
+def load_progress():
+    progress = {"user_id": "student_001", "completed_weeks": [], "completed_videos": {}, "completed_books": {}, "last_updated": None}
+    if PROGRESS_FILE.exists():
+        # Older or hand-written snapshots may omit keys; the defaults above fill them in
+        progress.update(orjson.loads(PROGRESS_FILE.read_bytes()))
+        # In memory: int week keys and sets of items (O(1) membership).
+        # On disk: JSON's string keys and sorted lists (OPT_NON_STR_KEYS converts the int keys back).
+        for key in ("completed_videos", "completed_books"):
+            progress[key] = {int(wk): set(items) for wk, items in progress[key].items()}
+    # Marks made since the last snapshot live in the journal
+    if PROGRESS_JOURNAL.exists():
+        with open(PROGRESS_JOURNAL, "rb", buffering=PROGRESS_BUFFER_SIZE) as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        apply_progress_event(progress, orjson.loads(line))
+                    except ValueError:
+                        continue  # torn line from a crash mid-append
+    return progress
+
+def save_progress(progress, event=None):
+    """Persist progress after a mark that has already been applied to it.
+
+    With an event the mark is appended to the journal, and the snapshot is rewritten
+    every JOURNAL_COMPACT_EVERY events and at exit; without one the snapshot is written now.
+    """
+    global _journal, _journal_events
+    progress["last_updated"] = datetime.now().isoformat(timespec="seconds")
+    if event is None:
+        compact_progress(progress)
+        return
+
+    if _journal is None:
+        _journal = open(PROGRESS_JOURNAL, "a+b", buffering=8192)
+        if _journal.seek(0, os.SEEK_END):
+            _journal.seek(-1, os.SEEK_END)
+            if _journal.read(1) != b"\n":
+                _journal.write(b"\n")  # keep new events off a torn last line
+        atexit.register(compact_progress, progress)
+    event["ts"] = progress["last_updated"]
+    _journal.write(orjson.dumps(event) + b"\n")
+    _journal.flush()
+    _journal_events += 1
+    if _journal_events >= JOURNAL_COMPACT_EVERY:
+        compact_progress(progress)
+
+def sync_progress_journal():
+    """fsync journal appends so far; the dashboard debounces this across bursts of marks."""
+    if _journal is not None:
+        os.fsync(_journal.fileno())
+
+def compact_progress(progress):
+    """Atomically replace the snapshot, then drop the journal it now covers."""
+    global _journal_events
+    # A crash mid-write leaves only the temp file; the old snapshot (plus journal) stays intact
+    tmp = PROGRESS_FILE.with_suffix(".json.tmp")
+    with open(tmp, "wb", buffering=PROGRESS_BUFFER_SIZE) as f:
+        f.write(orjson.dumps(progress, default=_json_default, option=orjson.OPT_NON_STR_KEYS))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, PROGRESS_FILE)
+    if _journal is not None:
+        _journal.seek(0)
+        _journal.truncate()
+    else:
+        PROGRESS_JOURNAL.unlink(missing_ok=True)
+    _journal_events = 0
+
+STUDY_PLAN = load_study_plan()
+PROGRESS = load_progress()
@@ -0,0 +1,32 @@
+import orjson
+
+from answers_log import append_jsonl, iter_jsonl, load_answers
+
+
+def test_legacy_json_is_migrated_once_in_one_batch(tmp_path):
+    legacy = tmp_path / "answers_tracker.json"
+    log = tmp_path / "answers_tracker.jsonl"
+    entries = [{"week": 1, "question_index": i, "user_answer": str(i)} for i in range(3)]
+    legacy.write_bytes(orjson.dumps({"user_id": "student_001", "answers": entries}))
+
+    assert load_answers(legacy, log)["answers"] == entries
+    assert log.read_bytes().count(b"\n") == 3
+
+    # The log is now the source of truth; the legacy file is not read again
+    legacy.write_bytes(orjson.dumps({"answers": [{"week": 9}]}))
+    assert load_answers(legacy, log)["answers"] == entries
+
+
+def test_missing_files_give_empty_answers(tmp_path):
+    answers = load_answers(tmp_path / "answers_tracker.json", tmp_path / "answers_tracker.jsonl")
+    assert answers == {"user_id": "student_001", "answers": []}
+
+
+def test_torn_last_line_is_skipped_and_next_append_survives(tmp_path):
+    log = tmp_path / "answers_tracker.jsonl"
+    log.write_bytes(b'{"week":1}\n{"week":2,"user_ans')
+
+    assert list(iter_jsonl(log)) == [{"week": 1}]
+
+    append_jsonl(log, {"week": 3})
+    assert list(iter_jsonl(log)) == [{"week": 1}, {"week": 3}]
@@ -0,0 +1,164 @@
+import zipfile
+from xml.sax.saxutils import escape
+
+import fitz
+
+from parser_engine import find_fields, parse_docx_file, parse_pdf_file
+
+
+def write_pdf(path, pages):
+    """Write a PDF with one page per string, one text line per newline."""
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), text, fontsize=10)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+# Minimal DOCX package parts; python-docx is not a dependency, so fixtures are written by hand
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="word/document.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+
+
+def docx_paragraph(text):
+    return f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def write_docx(path, rows, paragraphs):
+    """Write a DOCX with a two-column table of rows followed by the paragraphs."""
+    table = "".join(
+        f"<w:tr><w:tc>{docx_paragraph(key)}</w:tc><w:tc>{docx_paragraph(val)}</w:tc></w:tr>"
+        for key, val in rows
+    )
+    body = f"<w:tbl>{table}</w:tbl>" + "".join(docx_paragraph(text) for text in paragraphs)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        z.writestr("_rels/.rels", DOCX_RELS)
+        z.writestr("word/document.xml", document)
+    return path
+
+
+HEADER = "\n".join([
+    "Course Code: MAT101",
+    "Course Name: Calculus",
+    "Prerequisite: None",
+    "Credit Hours: 3",
+    "Lecturer: Dr Ada",
+    "Email: ada@uni.edu",
+    "Purpose of the course",
+    "Build limits and derivatives",
+    "Course objectives",
+    "Differentiate functions",
+    "Course Assessment",
+    "CAT 30%, Exam 70%",
+    "Core Reading",
+    "Stewart, Calculus",
+    "Recommended References",
+    "Spivak, Calculus",
+])
+
+
+def test_pdf_header_before_schedule_keeps_weekly_topics(tmp_path):
+    # Every single-valued field is filled on page 1, but the schedule only starts on page 2
+    pdf = write_pdf(tmp_path / "outline.pdf", [HEADER, "Week 1: Intro\nWeek 2: More"])
+
+    data = parse_pdf_file(str(pdf))
+
+    assert data["weekly_topics"] == ["Week 1: Intro", "Week 2: More"]
+    assert data["course_code"] == "MAT101"
+    assert data["references"] == "Spivak, Calculus"
+
+
+# Expected dicts below are the output of the original (pre-optimization) parsers on the same fixtures
+BASELINE_FIELDS = {
+    "course_code": "MAT101",
+    "course_name": "Calculus",
+    "prerequisite": "None",
+    "credit_hours": "3",
+    "lecturer": "Dr Ada",
+    "email": "ada@uni.edu",
+    "purpose": "Build limits and derivatives",
+    "objectives": "Differentiate functions",
+    "core_reading": "Stewart, Calculus",
+    "references": "Spivak, Calculus",
+}
+
+
+def test_pdf_matches_baseline_single_page(tmp_path):
+    pdf = write_pdf(tmp_path / "outline.pdf", [HEADER + "\nWeek 1: Intro\nWeek 2: More"])
+
+    assert parse_pdf_file(str(pdf)) == {
+        **BASELINE_FIELDS,
+        "weekly_topics": ["Week 1: Intro", "Week 2: More"],
+        "assessment": "CAT 30%, Exam 70%",
+    }
+
+
+def test_pdf_matches_baseline_schedule_across_pages(tmp_path):
+    pdf = write_pdf(tmp_path / "outline.pdf", [HEADER, "Week 1: Intro\nWeek 2: More", "Week 3: Last"])
+
+    assert parse_pdf_file(str(pdf)) == {
+        **BASELINE_FIELDS,
+        "weekly_topics": ["Week 1: Intro", "Week 2: More", "Week 3: Last"],
+        "assessment": "CAT 30%, Exam 70%",
+    }
+
+
+def test_overlapping_keywords_are_all_found():
+    # "course" ends the purpose keyword and starts the course-name one
+    assert find_fields("Purpose of the course name: Calculus") == {"purpose", "course_name"}
+
+
+def test_pdf_overlapping_keywords_match_baseline(tmp_path):
+    pdf = write_pdf(tmp_path / "outline.pdf", [
+        "Purpose of the course name: Calculus\nBuild limits\nCourse code: MAT101\nWeek 1: Intro"])
+
+    data = parse_pdf_file(str(pdf))
+
+    # The original elif chain tested "course name" before "purpose of the course"
+    assert data["course_name"] == "Calculus"
+    assert data["purpose"] is None
+    assert data["weekly_topics"] == ["Week 1: Intro"]
+
+
+def test_docx_matches_baseline(tmp_path):
+    rows = [
+        ("Course Code", "MAT101"), ("Course Name", "Calculus"), ("Prerequisite", "None"),
+        ("Credit Hours", "3"), ("Lecturer", "Dr Ada"), ("Email", "ada@uni.edu"),
+        ("Week 1", "Limits"), ("Week 2", "Derivatives"),
+    ]
+    paragraphs = [
+        "Purpose of the course", "Build limits and derivatives", "",
+        "Course objectives", "Differentiate functions",
+        "Course Assessment", "CAT 30%", "Exam 70%",
+        "Core Reading", "Stewart, Calculus",
+        "Recommended References", "Spivak, Calculus",
+    ]
+    docx = write_docx(tmp_path / "outline.docx", rows, paragraphs)
+
+    assert parse_docx_file(str(docx)) == {
+        **BASELINE_FIELDS,
+        "weekly_topics": ["Week 1 Limits", "Week 2 Derivatives"],
+        "assessment": "CAT 30%\nExam 70%",
+    }
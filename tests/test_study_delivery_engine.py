@@ -0,0 +1,60 @@
+import importlib
+import sys
+from datetime import date
+
+import orjson
+import pytest
+
+
+def week(n, start, end):
+    return {"week": n, "topic": f"Topic {n}", "calendar": {"start_date": start, "end_date": end}}
+
+
+PLAN = {
+    "course_name": "Calculus",
+    "course_code": "MAT101",
+    # Listed out of order; lookups must not depend on plan order
+    "weeks": [
+        week(2, "Jan 13, 2025", "Jan 19, 2025"),
+        week(1, "Jan 06, 2025", "Jan 12, 2025"),
+        week(3, "Jan 27, 2025", "Feb 02, 2025"),
+    ],
+}
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "study_plan.json").write_bytes(orjson.dumps(PLAN))
+    import study_plan_store
+    import study_delivery_engine
+    importlib.reload(study_plan_store)
+    return importlib.reload(study_delivery_engine)
+
+
+@pytest.mark.parametrize("day, expected", [
+    (date(2025, 1, 6), 1),
+    (date(2025, 1, 12), 1),
+    (date(2025, 1, 13), 2),
+    (date(2025, 1, 22), None),  # gap between weeks 2 and 3
+    (date(2025, 2, 2), 3),
+    (date(2025, 1, 5), None),
+    (date(2025, 2, 3), None),
+])
+def test_week_lookup(engine, day, expected):
+    found = engine.get_current_week_plan(engine.study_plan, day)
+    assert (found and found["week"]) == expected
+
+
+def test_week_lookup_cache_follows_the_latest_plan(engine):
+    store = sys.modules["study_plan_store"]  # loaded by the fixture, from tmp_path
+    day = date(2025, 1, 7)
+    assert engine.get_current_week_plan(engine.study_plan, day)["week"] == 1
+
+    # A new plan object covering the same day must not be served the old plan's week
+    other = {"weeks": [week(7, "Jan 06, 2025", "Jan 12, 2025")]}
+    assert engine.get_current_week_plan(other, day)["week"] == 7
+    assert store._week_ranges[0] is other
+
+    assert engine.get_current_week_plan(engine.study_plan, day)["week"] == 1
+    assert store._week_ranges[0] is engine.study_plan
@@ -0,0 +1,87 @@
+import atexit
+import importlib
+
+import orjson
+import pytest
+
+PLAN = {"course_name": "Calculus", "course_code": "MAT101", "weeks": []}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Fresh study_plan_store loaded from an empty working directory."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "study_plan.json").write_bytes(orjson.dumps(PLAN))
+    import study_plan_store
+    store = importlib.reload(study_plan_store)
+    yield store
+    if store._journal is not None:
+        store._journal.close()
+    atexit.unregister(store.compact_progress)
+
+
+def mark(store, progress, event):
+    """Apply a mark the way the dashboard does, then persist it."""
+    store.apply_progress_event(progress, event)
+    store.save_progress(progress, dict(event))
+
+
+def test_journal_replays_marks_without_a_snapshot(store):
+    progress = store.load_progress()
+    mark(store, progress, {"op": "video", "wk": 1, "item": "v1"})
+    mark(store, progress, {"op": "book", "wk": 2, "item": "b1"})
+    mark(store, progress, {"op": "week", "wk": 1})
+
+    assert not store.PROGRESS_FILE.exists()
+    replayed = store.load_progress()
+    assert replayed["completed_videos"] == {1: {"v1"}}
+    assert replayed["completed_books"] == {2: {"b1"}}
+    assert replayed["completed_weeks"] == [1]
+    assert replayed["last_updated"] == progress["last_updated"]
+
+
+def test_torn_journal_line_is_skipped_and_next_mark_survives(store):
+    store.PROGRESS_JOURNAL.write_bytes(b'{"op":"week","wk":1}\n{"op":"video","wk":1,"it')
+
+    progress = store.load_progress()
+    assert progress["completed_weeks"] == [1]
+    assert progress["completed_videos"] == {}
+
+    mark(store, progress, {"op": "video", "wk": 3, "item": "v3"})
+    assert store.load_progress()["completed_videos"] == {3: {"v3"}}
+
+
+def test_snapshot_missing_keys_replays_with_defaults(store):
+    # Hand-written or older snapshot: no last_updated and no completed_books
+    store.PROGRESS_FILE.write_bytes(b'{"completed_weeks": [2], "completed_videos": {"2": ["v"]}}')
+    store.PROGRESS_JOURNAL.write_bytes(b'{"op":"book","wk":2,"item":"b","ts":"2025-01-07T10:00:00"}\n')
+
+    progress = store.load_progress()
+
+    assert progress["completed_weeks"] == [2]
+    assert progress["completed_videos"] == {2: {"v"}}
+    assert progress["completed_books"] == {2: {"b"}}
+    assert progress["last_updated"] == "2025-01-07T10:00:00"
+
+
+def test_compaction_folds_journal_into_snapshot(store, monkeypatch):
+    monkeypatch.setattr(store, "JOURNAL_COMPACT_EVERY", 2)
+    progress = store.load_progress()
+    mark(store, progress, {"op": "video", "wk": 1, "item": "v2"})
+    mark(store, progress, {"op": "video", "wk": 1, "item": "v1"})
+
+    assert store.PROGRESS_JOURNAL.read_bytes() == b""
+    assert not store.PROGRESS_FILE.with_suffix(".json.tmp").exists()  # replaced, not left behind
+    snapshot = orjson.loads(store.PROGRESS_FILE.read_bytes())
+    assert snapshot["completed_videos"] == {"1": ["v1", "v2"]}
+    assert store.load_progress()["completed_videos"] == {1: {"v1", "v2"}}
+
+
+def test_save_without_event_writes_snapshot_and_drops_journal(store):
+    store.PROGRESS_JOURNAL.write_bytes(b'{"op":"week","wk":4}\n')
+    progress = store.load_progress()
+
+    store.save_progress(progress)
+
+    assert not store.PROGRESS_JOURNAL.exists()
+    assert store.load_progress()["completed_weeks"] == [4]